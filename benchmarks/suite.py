@@ -0,0 +1,180 @@
+"""
+Micro- and macro-benchmarks for the solver, planner, board and metrics hot paths.
+
+Every case runs on seeded boards, so two runs measure the same work:
+    python -m benchmarks.suite --output bench.json                 # record
+    python -m benchmarks.suite --compare bench.json                # flag slowdowns vs. a baseline
+    python -m benchmarks.suite --quick --filter analyzer           # subset, fewer repeats
+
+Results are written as JSON: {"meta": {...}, "results": {case: {"median", "min", "mean", "repeat"}}}
+with times in seconds. --compare exits with status 1 if any case's median is slower than the
+baseline's by more than --threshold (default 10%).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from src.game.presets import PRESETS
+from src.simulation.game import play_game
+from src.simulation.registry import COMPONENTS, resolve
+
+SEED = 12345
+
+# Board classes each planner / analyzer is meant to run on
+PLANNER_BOARDS = {"mdp": "classic", "mdp_sj": "sj", "mdp_withclues": "withclues"}
+ANALYZERS = ["bayesian", "bayesian_sj", "bayesian_sj_2", "bayesian_sj_3", "bayesian_withclue", "rules"]
+
+
+def measure(fn, setup=None, repeat=5):
+    """Times `fn(setup())` `repeat` times; setup runs outside the timed region."""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn(arg)
+            times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "mean": statistics.fmean(times), "repeat": repeat}
+
+
+def opened_board(board_name, width, height, mines, seed=SEED):
+    """Seeded board after its first flood fill (the first zero cell in board order)."""
+    board = resolve("board", board_name)(width, height, mines, seed=seed)
+    safe = [c for row in board.grid for c in row if not c.has_mine]
+    start = next((c for c in safe if c.neighbor_mines == 0), safe[0])
+    board.reveal_cell(start.x, start.y)
+    return board
+
+
+def cases(sizes):
+    """Yields (name, fn, setup) for every benchmark case."""
+    for preset in sizes:
+        w, h, m = PRESETS[preset]
+
+        for board_name in ("classic", "sj", "withclues"):
+            board_class = resolve("board", board_name)
+            yield (f"board/construct/{board_name}/{preset}",
+                   lambda _, cls=board_class, w=w, h=h, m=m: cls(w, h, m, seed=SEED), None)
+
+            def fresh(cls=board_class, w=w, h=h, m=m):
+                board = cls(w, h, m, seed=SEED)
+                safe = [c for row in board.grid for c in row if not c.has_mine]
+                return board, next((c for c in safe if c.neighbor_mines == 0), safe[0])
+            yield (f"board/flood_fill/{board_name}/{preset}",
+                   lambda arg: arg[0].reveal_cell(arg[1].x, arg[1].y), fresh)
+
+        position = opened_board("withclues", w, h, m)
+        for name in ANALYZERS:
+            analyzer_class = resolve("analyzer", name)
+            yield (f"analyzer/{name}/{preset}",
+                   lambda _, cls=analyzer_class, board=position: cls().compute_probabilities(board), None)
+
+        probabilities = resolve("analyzer", "bayesian_sj_2")().compute_probabilities(position)
+        for name in ("classic", "sj"):
+            metrics_class = resolve("metrics", name)
+            yield (f"metrics/dynamic_gr/{name}/{preset}",
+                   lambda gr, board=position, p=probabilities: gr.update(board, 0, p),
+                   lambda cls=metrics_class: cls())
+
+    # Planner search cost grows fast with depth, so it is measured on the smallest preset only
+    w, h, m = PRESETS[sizes[0]]
+    for planner, board_name in PLANNER_BOARDS.items():
+        board = opened_board(board_name, w, h, m)
+        probabilities = resolve("analyzer", "bayesian_withclue" if board_name == "withclues" else "bayesian_sj_2")()
+        probabilities = probabilities.compute_probabilities(board)
+        mdp_class = resolve("planner", planner)
+        for depth in (1, 2, 3):
+            yield (f"planner/{planner}/depth{depth}/{sizes[0]}",
+                   lambda mdp: mdp.find_best_action(),
+                   lambda cls=mdp_class, b=board, p=probabilities, d=depth: cls(b, dict(p), d, reduce_actions=True))
+        # The full action space (the planners' default) takes over a second at depth 2, so stop there
+        for depth in (1, 2):
+            yield (f"planner/{planner}/depth{depth}/actions=full/{sizes[0]}",
+                   lambda mdp: mdp.find_best_action(),
+                   lambda cls=mdp_class, b=board, p=probabilities, d=depth: cls(b, dict(p), d, reduce_actions=False))
+
+    for variant in ("classic", "withclues", "rules"):
+        yield (f"game/{variant}/{sizes[0]}",
+               lambda _, v=variant, w=w, h=h, m=m: [play_game(v, w, h, m, seed=SEED + i, log_file=os.devnull)
+                                                    for i in range(3)],
+               None)
+
+    # Every registered planner on the default variant, as `simulate.py --planner <name>` runs it
+    for planner in sorted(COMPONENTS["planner"]):
+        yield (f"game/classic/planner={planner}/{sizes[0]}",
+               lambda _, p=planner, w=w, h=h, m=m: [play_game("classic", w, h, m, seed=SEED + i,
+                                                              log_file=os.devnull, planner=p)
+                                                    for i in range(3)],
+               None)
+
+
+def run_suite(sizes=("beginner", "intermediate", "expert"), repeat=5, name_filter=None):
+    results = {}
+    for name, fn, setup in cases(list(sizes)):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(fn, setup, repeat)
+        print(f"{name:<52} {results[name]['median'] * 1000:10.3f} ms", file=sys.stderr)
+    return {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": repeat, "sizes": list(sizes)},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Prints median ratios against a baseline report.
+    :return: names of the cases slower than baseline by more than `threshold`.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<52} {'new':>10}")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:<52} {ratio:9.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown ratio (default: 0.10)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (default: 5)")
+    parser.add_argument("--quick", action="store_true", help="beginner boards only, 3 runs per case")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    sizes = ("beginner",) if args.quick else ("beginner", "intermediate", "expert")
+    repeat = 3 if args.quick else args.repeat
+    report = run_suite(sizes, repeat, args.filter)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,117 @@
+import argparse
 from src.game.board_sj import Board
 from src.game.game_manager_sj import GameManager
 from src.ai.bayesian_sj_3 import BayesianAnalyzer
 from src.ai.mdp_sj import MDP
+from src.ai.planner import PersistentPlanner
+from src.ai.opening_book import OpeningBook
+from src.ai.certain_moves import DecisionStats, certain_moves, apply_certain_moves
+from src.ai.macros import apply_action, expand_action
 from src.metrics.dynamic_gr_sj import DynamicGR
-from src.utils.logger import CSVLogger
+from src.metrics.report import render_reports
+from src.simulation.campaign import run_campaign
+from src.simulation.game import watch_components
+from src.utils.logger import BufferedCSVLogger
+from src.utils.memory import MemoryProfiler
+from src.utils.profiler import NULL_PROFILER
 
-def run_single_game(width=9, height=9, mines=10, max_steps=200, log_file="gr_metrics.csv"):
-    board = Board(width, height, mines)
+def run_single_game(width=9, height=9, mines=10, max_steps=200, log_file="gr_metrics.csv", stats=None, seed=None,
+                    node_limit=2000, time_limit=None, profiler=None):
+    board = Board(width, height, mines, seed=seed)
     gm = GameManager(board)
     bayes = BayesianAnalyzer()
+    book = OpeningBook.load()
+    # One planner per game so search work carries over between moves. The node budget keeps
+    # seeded games reproducible; a time_limit (opt-in) makes the searched depth depend on machine load
+    planner = PersistentPlanner(MDP, depth=4, reduce_actions=True, node_limit=node_limit, time_limit=time_limit)
     gr = DynamicGR(log_file=log_file)
+    stats = stats if stats is not None else DecisionStats()
+    # Opt-in per-phase accounting, e.g. a MemoryProfiler (see --memory)
+    profiler = profiler if profiler is not None else NULL_PROFILER
+    if profiler.enabled:
+        watch_components(profiler, bayes, gr, gm, planner)
 
     step = 0
     while not gm.is_over() and step < max_steps:
         try:
-            probabilities = bayes.compute_probabilities(board)
+            profiler.begin_step(step)
+            with profiler.phase("compute_probabilities"):
+                probabilities = bayes.compute_probabilities(board)
             bayes.print_probability_matrix()
-            mdp = MDP(board, probabilities, depth=2)
-            action = mdp.find_best_action()
 
-            if action is None:
-                print("No valid action found. Ending game.")
-                break
+            # Fast path: apply every provably safe/mined cell at once, skip the planner
+            batch = certain_moves(probabilities)
+            if batch:
+                with profiler.phase("make_move"):
+                    apply_certain_moves(gm, batch)
+                    planner.advance(board, batch)
+                stats.record_batch(batch)
+            else:
+                # Opening book first, the planner only for positions it does not cover
+                action = book.lookup(board)
+                if action is not None:
+                    stats.record_book()
+                else:
+                    with profiler.phase("search"):
+                        action = planner.find_best_action(board, probabilities)
+                    stats.record_planner()
 
-            act_type, x, y = action
-            gm.make_move(x, y, act_type)
+                if action is None:
+                    print("No valid action found. Ending game.")
+                    break
 
-            gr_value, gr_data = gr.update(board, step, probabilities)
+                # Macro actions expand into their primitive moves
+                with profiler.phase("make_move"):
+                    apply_action(gm, action)
+                    planner.advance(board, expand_action(action))
+
+            with profiler.phase("metrics"):
+                gr_value, gr_data = gr.update(board, step, probabilities)
+            profiler.end_step()
             step += 1
         except Exception as e:
             print(f"Error during game execution: {e}")
             break
+    profiler.end_game()
 
-    # Optional: Visualize GR trends
-    gr.visualize_gr_history()
+    gr.close()
 
     return gm.is_victory()
 
-def run_multiple_games(num_games=5, width=9, height=9, mines=10, max_steps=200):
-    wins = 0
-    logger = CSVLogger("game_results.csv")
+def run_multiple_games(num_games=5, width=9, height=9, mines=10, max_steps=200, workers=0, master_seed=0,
+                       plots=False, plot_dir="plots", memory=False):
+    logger = BufferedCSVLogger("game_results.csv")
+    outcomes = {}
+
+    def report(result):
+        outcomes[result.index + 1] = result.won
+        logger.log(result.index + 1, {"step": "-", "gr": "-", "complexity": "-", "goal_progress": "-", "entropy": "-", "acceleration": "-", "jerk": "-", "result": "Win" if result.won else "Lose"})
+        print(f"Game {result.index + 1}/{num_games}: {'Win' if result.won else 'Lose'}")
 
-    for i in range(num_games):
-        print(f"Starting Game {i + 1}/{num_games}")
-        result = run_single_game(width, height, mines, max_steps, log_file=f"game_{i + 1}_metrics.csv")
-        wins += int(result)
-        logger.log(i + 1, {"step": "-", "gr": "-", "complexity": "-", "goal_progress": "-", "entropy": "-", "acceleration": "-", "jerk": "-", "result": "Win" if result else "Lose"})
+    # With `memory`, one MemoryProfiler shared by every game (played inline), so growth across games shows up
+    profiler = MemoryProfiler() if memory else None
+    if profiler is not None:
+        workers = 0
 
-        print(f"Game {i + 1}/{num_games}: {'Win' if result else 'Lose'}")
+    # Seeded games, sharded across `workers` processes
+    campaign = run_campaign(run_single_game, num_games, master_seed=master_seed, workers=workers, log_dir=".",
+                            quiet=workers > 1, on_result=report, width=width, height=height, mines=mines,
+                            max_steps=max_steps, profiler=profiler)
+    logger.close()
+    print(campaign.summary())
+    if profiler is not None:
+        profiler.stop()
+        print(profiler.report())
 
-    print(f"Win rate: {wins}/{num_games} ({(wins / num_games) * 100:.2f}%)")
+    # With `plots`, GR trends are rendered to `plot_dir`/game_<n>_gr.png and campaign_gr.png once all games are over
+    if plots:
+        paths = render_reports(".", plot_dir, outcomes=outcomes, max_games=None, workers=workers or None)
+        print(f"{len(paths)} plots written to {plot_dir}")
 
 if __name__ == "__main__":
-    run_multiple_games(num_games=5)
+    parser = argparse.ArgumentParser(description="Seeded campaign of the sj runner.")
+    parser.add_argument("--memory", action="store_true",
+                        help="account allocations per phase, step and game with tracemalloc (games run inline)")
+    parser.add_argument("--plots", action="store_true", help="render the GR plots to plots/ after the games")
+    args = parser.parse_args()
+    run_multiple_games(num_games=5, plots=args.plots, memory=args.memory)
@@ -1,22 +1,43 @@
+import argparse
+import os
 from src.game.board_withclues import Board
 from src.game.game_manager_2 import GameManager
 from src.ai.bayesian_withclue import BayesianAnalyzer
 from src.ai.mdp_withclues import MDP
+from src.ai.planner import PersistentPlanner
+from src.ai.opening_book import OpeningBook
+from src.ai.certain_moves import DecisionStats, certain_moves, apply_certain_moves
+from src.ai.macros import apply_action, expand_action
 from src.metrics.dynamic_gr import DynamicGR
-from src.utils.logger import CSVLogger
+from src.simulation.campaign import run_campaign
+from src.simulation.game import watch_components
+from src.utils.logger import BufferedCSVLogger
+from src.utils.memory import MemoryProfiler
+from src.utils.profiler import NULL_PROFILER
 
-def run_single_game(width=9, height=9, mines=10, max_steps=200):
+def run_single_game(width=9, height=9, mines=10, max_steps=200, stats=None, seed=None, log_file="gr_metrics.csv",
+                    profiler=None):
     # Initialize game components
-    board = Board(width, height, mines)
+    board = Board(width, height, mines, seed=seed)
     gm = GameManager(board)
     bayes = BayesianAnalyzer()
+    book = OpeningBook.load()
+    # One planner per game so search work carries over between moves
+    planner = PersistentPlanner(MDP, depth=2, reduce_actions=True)
     gr = DynamicGR()
-    logger = CSVLogger("gr_metrics.csv")
+    logger = BufferedCSVLogger(log_file)
+    stats = stats if stats is not None else DecisionStats()
+    # Opt-in per-phase accounting, e.g. a MemoryProfiler (see --memory)
+    profiler = profiler if profiler is not None else NULL_PROFILER
+    if profiler.enabled:
+        watch_components(profiler, bayes, gr, gm, planner)
 
     step = 0
     while not gm.is_over() and step < max_steps:
+        profiler.begin_step(step)
         # Compute probabilities for each cell
-        probabilities = bayes.compute_probabilities(board)
+        with profiler.phase("compute_probabilities"):
+            probabilities = bayes.compute_probabilities(board)
         # bayes.print_probability_matrix()
 
         # Incorporate clues into decision-making
@@ -28,33 +49,63 @@ def run_single_game(width=9, height=9, mines=10, max_steps=200):
             # Adjust probabilities slightly based on clue score
             probabilities[(cell.x, cell.y)] *= (1 + 0.1 * clue_score)
 
-        # Find the best action using the MDP
-        mdp = MDP(board, probabilities, depth=2)
-        action = mdp.find_best_action()
+        # Fast path: apply every provably safe/mined cell at once, skip the planner
+        batch = certain_moves(probabilities)
+        if batch:
+            with profiler.phase("make_move"):
+                apply_certain_moves(gm, batch)
+                planner.advance(board, batch)
+            stats.record_batch(batch)
+        else:
+            # Find the best action using the MDP
+            # Opening book first, the planner only for positions it does not cover
+            action = book.lookup(board)
+            if action is not None:
+                stats.record_book()
+            else:
+                with profiler.phase("search"):
+                    action = planner.find_best_action(board, probabilities)
+                stats.record_planner()
 
-        if action is None:
-            # No action available, terminate
-            break
+            if action is None:
+                # No action available, terminate
+                break
 
-        act_type, x, y = action
-        gm.make_move(x, y, act_type)
+            # Macro actions expand into their primitive moves
+            with profiler.phase("make_move"):
+                apply_action(gm, action)
+                planner.advance(board, expand_action(action))
 
         # Update and log GR metrics
-        gr_value, gr_data = gr.update(board, step, probabilities)
-        logger.log(step, gr_data)
+        with profiler.phase("metrics"):
+            gr_value, gr_data = gr.update(board, step, probabilities)
+        with profiler.phase("log"):
+            logger.log(step, gr_data)
 
+        profiler.end_step()
         step += 1
+    profiler.end_game()
 
+    logger.close()
     return gm.is_victory()
 
 if __name__ == "__main__":
-    # Run multiple simulations and print the success rate
+    parser = argparse.ArgumentParser(description="Seeded campaign of the withclues runner.")
+    parser.add_argument("--memory", action="store_true",
+                        help="account allocations per phase, step and game with tracemalloc (games run inline)")
+    args = parser.parse_args()
+
+    # Run multiple simulations (seeded, sharded across workers) and print the success rate
     num_games = 20
-    wins = 0
-    for i in range(num_games):
-        result = run_single_game(9, 9, 10)
-        if result:
-            wins += 1
-        print(f"Game {i+1}/{num_games}: {'Win' if result else 'Lose'}")
-
-    print(f"Win rate: {wins}/{num_games}")
+    # One profiler shared by every game, so growth across games shows up
+    memory = MemoryProfiler() if args.memory else None
+
+    def report(result):
+        print(f"Game {result.index + 1}/{num_games}: {'Win' if result.won else 'Lose'}")
+
+    campaign = run_campaign(run_single_game, num_games, master_seed=0, workers=0 if memory else os.cpu_count(),
+                            on_result=report, width=9, height=9, mines=10, profiler=memory)
+    print(campaign.summary())
+    if memory is not None:
+        memory.stop()
+        print(memory.report())
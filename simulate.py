@@ -0,0 +1,138 @@
+"""
+Unified simulation entry point: any registered board / manager / analyzer / planner / metrics
+combination, on a difficulty preset or a custom size, over a seeded (parallel) campaign.
+
+    python simulate.py --variant sj --preset intermediate --games 200 --workers 8 --seed 1
+    python simulate.py --planner mcts --analyzer bayesian_sj_3 --planner-options '{"rollout_depth": 20}' --output runs/mcts
+    python simulate.py --profile --output runs/profile --games 3
+    python simulate.py --memory --games 5
+    python simulate.py --format columnar --output runs/big --games 10000
+    python simulate.py --plots --output runs/plots --games 20
+    python simulate.py --records --output runs/replayable --games 100000
+    python simulate.py --list
+"""
+import argparse
+import csv
+import json
+import os
+from src.game.presets import PRESETS
+from src.metrics.report import render_reports
+from src.simulation.campaign import run_campaign
+from src.simulation.game import play_game
+from src.simulation.registry import COMPONENTS, VARIANTS
+from src.utils.memory import MemoryProfiler
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Minesweeper AI simulation campaign.")
+    parser.add_argument("--list", action="store_true", help="list registered components and exit")
+    parser.add_argument("--variant", default="classic", choices=sorted(VARIANTS),
+                        help="default component combination (default: classic)")
+    for kind in ("board", "manager", "analyzer", "planner", "metrics"):
+        parser.add_argument(f"--{kind}", choices=sorted(COMPONENTS[kind]),
+                            help=f"override the variant's {kind}")
+    parser.add_argument("--planner-options", type=json.loads, default=None, metavar="JSON",
+                        help='override the planner options, e.g. \'{"reduce_actions": true}\'')
+    parser.add_argument("--preset", default="beginner", choices=sorted(PRESETS),
+                        help="board size and mine count (default: beginner)")
+    parser.add_argument("--width", type=int, help="override the preset width")
+    parser.add_argument("--height", type=int, help="override the preset height")
+    parser.add_argument("--mines", type=int, help="override the preset mine count")
+    parser.add_argument("--games", type=int, default=10, help="number of games (default: 10)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="master seed for the board layouts (default: 0)")
+    parser.add_argument("--depth", type=int, help="planner search depth (default: the variant's)")
+    parser.add_argument("--max-steps", type=int, default=200, help="step cap per game (default: 200)")
+    parser.add_argument("--output", help="directory for per-game metrics and game_results.csv (default: none)")
+    parser.add_argument("--format", default="csv", choices=["csv", "columnar"],
+                        help="per-game metrics as CSV files, or one columnar store in <output>/metrics")
+    parser.add_argument("--aggregate", action="store_true",
+                        help="streaming per-step GR statistics by outcome, written to <output>/aggregate.csv")
+    parser.add_argument("--profile", action="store_true",
+                        help="write a Chrome trace and phase summary per game to the output directory")
+    parser.add_argument("--records", action="store_true",
+                        help="append a compact replayable record of every game to <output>/records")
+    parser.add_argument("--plots", action="store_true",
+                        help="render GR plots to <output>/plots after the campaign (campaign and per-game)")
+    parser.add_argument("--plot-games", type=int, default=50, help="per-game plots to render (default: 50)")
+    parser.add_argument("--memory", action="store_true",
+                        help="tracemalloc accounting per phase and owning object (runs the games inline)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile and not args.output:
+        raise SystemExit("--profile needs --output")
+    if args.format == "columnar" and not args.output:
+        raise SystemExit("--format columnar needs --output")
+    if args.aggregate and not args.output:
+        raise SystemExit("--aggregate needs --output")
+    if args.plots and not args.output:
+        raise SystemExit("--plots needs --output")
+    if args.records and not args.output:
+        raise SystemExit("--records needs --output")
+    if args.profile and args.memory:
+        raise SystemExit("--profile and --memory cannot be combined")
+    if args.list:
+        for kind, entries in COMPONENTS.items():
+            print(f"{kind}: {', '.join(sorted(entries))}")
+        print(f"variant: {', '.join(sorted(VARIANTS))}")
+        print(f"preset: {', '.join(f'{name} {w}x{h}/{m}' for name, (w, h, m) in PRESETS.items())}")
+        return
+
+    width, height, mines = PRESETS[args.preset]
+    width = args.width or width
+    height = args.height or height
+    mines = args.mines or mines
+
+    overrides = {kind: getattr(args, kind) for kind in ("board", "manager", "analyzer", "planner", "metrics")
+                 if getattr(args, kind)}
+    if args.planner_options is not None:
+        overrides["planner_options"] = args.planner_options
+    if args.format == "columnar":
+        overrides["metrics_store"] = os.path.join(args.output, "metrics")
+    if args.records:
+        overrides["record_store"] = os.path.join(args.output, "records")
+    memory = None
+    if args.memory:
+        # One profiler shared by every game, so growth across games shows up
+        memory = MemoryProfiler()
+        overrides["profiler"] = memory
+
+    results = []
+
+    def report(result):
+        results.append(result)
+        print(f"Game {result.index + 1}/{args.games} (seed {result.seed}): "
+              f"{'Win' if result.won else 'Lose'} in {result.steps} steps")
+
+    campaign = run_campaign(play_game, args.games, master_seed=args.seed, workers=0 if memory else args.workers,
+                            log_dir=args.output, profile=args.profile, aggregate=args.aggregate, on_result=report,
+                            variant=args.variant, width=width, height=height, mines=mines, max_steps=args.max_steps,
+                            depth=args.depth, **overrides)
+
+    if args.output:
+        with open(os.path.join(args.output, "game_results.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Game", "Seed", "Result", "Steps"])
+            for result in sorted(results):
+                writer.writerow([result.index + 1, result.seed, "Win" if result.won else "Lose", result.steps])
+    if campaign.metrics is not None:
+        campaign.metrics.to_csv(os.path.join(args.output, "aggregate.csv"))
+    print(campaign.summary())
+    if args.plots and results:
+        # Rendered from the recorded metrics in a separate process pool, after every game is over
+        columnar = args.format == "columnar"
+        outcomes = {result.seed if columnar else result.index + 1: result.won for result in results}
+        paths = render_reports(os.path.join(args.output, "metrics") if columnar else args.output,
+                               os.path.join(args.output, "plots"), outcomes, max_games=args.plot_games,
+                               workers=args.workers or None)
+        print(f"{len(paths)} plots written to {os.path.join(args.output, 'plots')}")
+    if memory is not None:
+        memory.stop()
+        print(memory.report())
+
+
+if __name__ == "__main__":
+    main()
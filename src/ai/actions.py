@@ -0,0 +1,38 @@
+def split_frontier(board):
+    """
+    Splits the unrevealed, unflagged cells into frontier cells (touching a revealed clue)
+    and interior cells (no revealed neighbor, so no clue constrains them directly).
+    :return: (frontier, interior) lists of cells in board order.
+    """
+    frontier = []
+    interior = []
+    for c in board.get_unrevealed_cells():
+        if any(n.revealed and not n.has_mine for n in board.get_neighbors(c.x, c.y)):
+            frontier.append(c)
+        else:
+            interior.append(c)
+    return frontier, interior
+
+
+def reduced_actions(board, probabilities, flag_threshold=0.7):
+    """
+    Action space with equivalent actions grouped:
+    - frontier cells are revealed in order of increasing risk,
+    - interior cells sharing a probability collapse to one representative reveal,
+    - flags are only proposed for cells at or above `flag_threshold`, riskiest first.
+    """
+    frontier, interior = split_frontier(board)
+
+    def p_mine(c):
+        return probabilities.get((c.x, c.y), 0.5)
+
+    candidates = sorted(frontier, key=p_mine)
+    representatives = {}
+    for c in interior:
+        representatives.setdefault(p_mine(c), c)
+    candidates.extend(sorted(representatives.values(), key=p_mine))
+
+    actions = [("reveal", c.x, c.y) for c in candidates]
+    flags = [c for c in candidates if p_mine(c) >= flag_threshold]
+    actions.extend(("flag", c.x, c.y) for c in sorted(flags, key=p_mine, reverse=True))
+    return actions
@@ -2,9 +2,10 @@ import itertools
 
 class BayesianAnalyzer:
     def __init__(self):
-        pass
+        self.configurations = 0  # Valid mine configurations found by the last enumeration
 
     def compute_probabilities(self, board):
+        self.configurations = 0
         unrevealed_cells = board.get_unrevealed_cells()
         if not unrevealed_cells:
             return {}
@@ -77,6 +78,7 @@ class BayesianAnalyzer:
                 valid_config_count += 1
                 for m in mines_set:
                     mine_counts[m] += 1
+        self.configurations = valid_config_count
 
         if valid_config_count == 0:
             # No valid configuration found; fallback to uniform
@@ -2,7 +2,7 @@ import itertools
 
 class BayesianAnalyzer:
     def __init__(self):
-        pass
+        self.configurations = 0  # Valid mine configurations found by the last enumeration
 
     def compute_probabilities(self, board):
         """
@@ -12,6 +12,7 @@ class BayesianAnalyzer:
         Returns:
             dict: A mapping of (x, y) coordinates to probabilities of being a mine.
         """
+        self.configurations = 0
         unrevealed_cells = board.get_unrevealed_cells()
         if not unrevealed_cells:
             return {}
@@ -66,6 +67,7 @@ class BayesianAnalyzer:
                 valid_config_count += 1
                 for m in mines_set:
                     mine_counts[m] += 1
+        self.configurations = valid_config_count
 
         # Compute probabilities
         if valid_config_count == 0:
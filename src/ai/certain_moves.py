@@ -0,0 +1,70 @@
+class DecisionStats:
+    """
+    Counts how often the decision loop takes the certain-move fast path versus
+    falling back to the (expensive) planner.
+    """
+    def __init__(self):
+        self.fast_path_steps = 0   # Steps resolved by applying a batch of certain moves
+        self.planner_steps = 0     # Steps that needed a genuine guess from the planner
+        self.book_steps = 0        # Steps answered by the opening book
+        self.certain_reveals = 0   # Provably safe cells revealed through the fast path
+        self.certain_flags = 0     # Provably mined cells flagged through the fast path
+
+    @property
+    def steps(self):
+        # Decision steps taken, whatever answered them
+        return self.fast_path_steps + self.planner_steps + self.book_steps
+
+    def record_batch(self, actions):
+        self.fast_path_steps += 1
+        for act_type, _, _ in actions:
+            if act_type == "reveal":
+                self.certain_reveals += 1
+            else:
+                self.certain_flags += 1
+
+    def record_planner(self):
+        self.planner_steps += 1
+
+    def record_book(self):
+        self.book_steps += 1
+
+    def merge(self, other):
+        self.fast_path_steps += other.fast_path_steps
+        self.planner_steps += other.planner_steps
+        self.book_steps += other.book_steps
+        self.certain_reveals += other.certain_reveals
+        self.certain_flags += other.certain_flags
+
+    def summary(self):
+        total = self.steps
+        share = (self.fast_path_steps / total) * 100 if total > 0 else 0.0
+        return (f"Fast path: {self.fast_path_steps} steps ({share:.1f}%), "
+                f"{self.certain_reveals} reveals, {self.certain_flags} flags | "
+                f"Book: {self.book_steps} steps | Planner: {self.planner_steps} steps")
+
+
+def certain_moves(probabilities):
+    """
+    Extract every provably safe reveal and provably mined flag from a probability map.
+    :param probabilities: dict mapping (x, y) to the probability of a mine.
+    :return: list of ("reveal" | "flag", x, y) actions, reveals first, in board order.
+    """
+    reveals = []
+    flags = []
+    for (x, y), p in sorted(probabilities.items(), key=lambda item: (item[0][1], item[0][0])):
+        if p <= 0.0:
+            reveals.append(("reveal", x, y))
+        elif p >= 1.0:
+            flags.append(("flag", x, y))
+    return reveals + flags
+
+
+def apply_certain_moves(gm, actions):
+    """
+    Apply a batch of certain moves through the game manager, stopping early if the game ends.
+    """
+    for act_type, x, y in actions:
+        if gm.is_over():
+            break
+        gm.make_move(x, y, act_type)
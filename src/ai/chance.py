@@ -0,0 +1,62 @@
+import copy
+import random
+from src.ai.layouts import ConstraintModel
+from src.game.zobrist import state_key
+
+SALT_MASK = (1 << 64) - 1
+
+
+def outcome_rng(seed, board, x, y):
+    """
+    Random generator for the chance node "reveal (x, y) on this board", derived only from
+    the seed and the position so that sampled values are reproducible across move orders,
+    transposition hits and worker processes.
+    """
+    return random.Random(hash((seed, board.zobrist_hash, x, y)))
+
+
+def sample_reveal_outcomes(board, x, y, samples, rng):
+    """
+    Sparse-sampling chance node for revealing (x, y) given that it is safe.
+
+    Draws `samples` hidden layouts consistent with the visible clues in which (x, y) holds
+    no mine, applies each to a copy of the board and reveals the cell there, so the
+    successor shows the clue (and flood fill) that layout implies instead of the true
+    hidden value. Successors revealing the same cells and clues are merged. Each successor
+    carries a `layout_salt` keying its subtree apart from boards with other hidden layouts.
+    :return: list of (weight, board) with weights summing to 1, or [] if no layout was found.
+    """
+    model = ConstraintModel(board)
+    target = model.index.get((x, y))
+    if target is None:
+        return []
+
+    outcomes = {}
+    drawn = 0
+    for _ in range(samples):
+        layout = model.sample(rng, fixed={target: False})
+        if layout is None:
+            break
+        drawn += 1
+        child = copy.deepcopy(board)
+        for i, (cx, cy) in enumerate(model.cells):
+            child.grid[cy][cx].has_mine = i in layout
+        for i, (cx, cy) in enumerate(model.cells):
+            cell = child.grid[cy][cx]
+            cell.neighbor_mines = 0 if cell.has_mine else child.count_neighbor_mines(cx, cy)
+        child.reveal_cell(x, y)
+
+        observed = tuple(
+            (cx, cy, child.grid[cy][cx].neighbor_mines)
+            for (cx, cy) in model.cells if child.grid[cy][cx].revealed
+        )
+        key = (state_key(child), observed)
+        if key in outcomes:
+            outcomes[key][0] += 1
+        else:
+            # Salt the subtree with the sampled layout (on top of any salt of the parent)
+            mines = tuple(model.cells[i] for i in sorted(layout))
+            child.layout_salt = hash((getattr(board, "layout_salt", 0), mines)) & SALT_MASK
+            outcomes[key] = [1, child]
+
+    return [(count / drawn, child) for count, child in outcomes.values()]
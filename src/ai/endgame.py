@@ -0,0 +1,117 @@
+from src.ai.layouts import ConstraintModel
+
+
+class EndgameSolver:
+    """
+    Exact endgame engine: maximizes the probability of winning instead of the one-step reward.
+
+    When at most `max_unknown` cells are unrevealed, every mine layout consistent with the
+    clues is enumerated as a bitmask over the unknown cells. A belief state is the set of
+    layouts still possible plus the cells revealed so far; revealing a cell splits it by the
+    clues (and flood fill) each layout would show. Win probabilities are memoized on the
+    canonical (revealed mask, frozenset of layouts) key.
+    """
+    def __init__(self, max_unknown=20, max_layouts=2000):
+        self.max_unknown = max_unknown
+        self.max_layouts = max_layouts
+        self.memo = {}
+        self.win_probability = None  # Win probability of the last returned move
+
+    def find_best_action(self, board):
+        """
+        :return: the move maximizing the win probability, or None when the board is not
+                 a small enough endgame (callers then fall back to their planner).
+                 A flagged cell that should be revealed is returned as a "flag" action to unflag it.
+        """
+        if board.game_over:
+            return None
+        model = ConstraintModel(board)
+        if not model.cells or len(model.cells) > self.max_unknown:
+            return None
+        layouts = model.enumerate(limit=self.max_layouts)
+        if not layouts:
+            return None
+
+        self._prepare(board, model)
+        self.memo = {}
+        self.win_probability, cell = self._solve(0, frozenset(layouts))
+        if cell is None:
+            return None
+        x, y = model.cells[cell]
+        return ("flag", x, y) if board.grid[y][x].flagged else ("reveal", x, y)
+
+    def _prepare(self, board, model):
+        n = len(model.cells)
+        self.n = n
+        self.all_mask = (1 << n) - 1
+        self.flagged_mask = 0
+        self.neighbor_masks = []
+        self.neighbor_lists = []
+        for i, (x, y) in enumerate(model.cells):
+            if board.grid[y][x].flagged:
+                self.flagged_mask |= 1 << i
+            unknown = [model.index[(c.x, c.y)] for c in board.get_neighbors(x, y) if (c.x, c.y) in model.index]
+            self.neighbor_lists.append(unknown)
+            mask = 0
+            for j in unknown:
+                mask |= 1 << j
+            self.neighbor_masks.append(mask)
+
+    def _observe(self, cell, layout, revealed):
+        # Cells revealed by opening `cell` under `layout` (flood fill like Board.reveal_cell) and their clues
+        stack = [cell]
+        clues = []
+        while stack:
+            i = stack.pop()
+            bit = 1 << i
+            if revealed & bit or (i != cell and self.flagged_mask & bit):
+                continue
+            revealed |= bit
+            clue = bin(layout & self.neighbor_masks[i]).count("1")
+            clues.append((i, clue))
+            if clue == 0:
+                stack.extend(self.neighbor_lists[i])
+        clues.sort()
+        return revealed, tuple(clues)
+
+    def _solve(self, revealed, belief):
+        key = (revealed, belief)
+        if key in self.memo:
+            return self.memo[key]
+
+        # Cells that are safe in at least one layout still have to be revealed
+        always_mined = self.all_mask
+        ever_mined = 0
+        for layout in belief:
+            always_mined &= layout
+            ever_mined |= layout
+        open_cells = [i for i in range(self.n) if not (revealed >> i) & 1 and not (always_mined >> i) & 1]
+        if not open_cells:
+            self.memo[key] = (1.0, None)
+            return self.memo[key]
+
+        # Revealing a provably safe cell never lowers the win probability: take it alone
+        certain = [i for i in open_cells if not (ever_mined >> i) & 1]
+        candidates = certain[:1] if certain else open_cells
+
+        total = len(belief)
+        best_value = -1.0
+        best_cell = None
+        for cell in candidates:
+            outcomes = {}
+            for layout in belief:
+                if (layout >> cell) & 1:
+                    continue  # Mine: the game is lost in this layout
+                outcomes.setdefault(self._observe(cell, layout, revealed), []).append(layout)
+            value = 0.0
+            for (new_revealed, _), group in outcomes.items():
+                win, _ = self._solve(new_revealed, frozenset(group))
+                value += len(group) / total * win
+            if value > best_value:
+                best_value = value
+                best_cell = cell
+                if value >= 1.0:
+                    break
+
+        self.memo[key] = (best_value, best_cell)
+        return self.memo[key]
@@ -0,0 +1,187 @@
+import itertools
+import math
+
+_NEIGHBORS = {}
+
+
+def neighbor_indices(width, height):
+    """
+    Returns, for every flat cell index (y * width + x), the list of neighbor indices.
+    Cached per board size.
+    """
+    size = (width, height)
+    if size not in _NEIGHBORS:
+        table = []
+        for y in range(height):
+            for x in range(width):
+                table.append([
+                    ny * width + nx
+                    for ny in (y - 1, y, y + 1)
+                    for nx in (x - 1, x, x + 1)
+                    if 0 <= nx < width and 0 <= ny < height and not (nx == x and ny == y)
+                ])
+        _NEIGHBORS[size] = table
+    return _NEIGHBORS[size]
+
+
+class ConstraintModel:
+    """
+    The hidden part of a board as a constraint problem over unknown cells.
+
+    Unknown cells are all unrevealed cells (flags are a player's guess, not evidence).
+    Every revealed clue constrains how many of its unknown neighbors hold a mine, and the
+    total number of mines left bounds the whole layout. Layouts are reported as sets of
+    indices into `self.cells`, or as bitmasks over the same indices.
+    """
+    def __init__(self, board):
+        self.width = board.width
+        self.height = board.height
+        self.cells = [(c.x, c.y) for row in board.grid for c in row if not c.revealed]
+        self.index = {xy: i for i, xy in enumerate(self.cells)}
+        revealed_mines = sum(1 for row in board.grid for c in row if c.revealed and c.has_mine)
+        self.mines_left = board.mines - revealed_mines
+
+        self.constraints = []
+        for row in board.grid:
+            for c in row:
+                if c.revealed and not c.has_mine:
+                    unknown = [self.index[(n.x, n.y)] for n in board.get_neighbors(c.x, c.y) if not n.revealed]
+                    if unknown:
+                        self.constraints.append((unknown, c.neighbor_mines))
+
+        # Frontier variables in constraint order so partial assignments are pruned early
+        self.frontier = []
+        seen = set()
+        for unknown, _ in self.constraints:
+            for i in unknown:
+                if i not in seen:
+                    seen.add(i)
+                    self.frontier.append(i)
+        self.interior = [i for i in range(len(self.cells)) if i not in seen]
+
+        # For every frontier variable, the constraints it takes part in
+        self.var_constraints = {i: [] for i in self.frontier}
+        for k, (unknown, _) in enumerate(self.constraints):
+            for i in unknown:
+                self.var_constraints[i].append(k)
+
+    def _search(self, rng, fixed, max_nodes, visit):
+        """
+        Depth-first search over frontier assignments. `visit(assignment)` is called with every
+        complete consistent frontier assignment; returning True stops the search.
+        With an `rng`, values are tried in random order (used for sampling).
+        :return: False if the node budget ran out, True otherwise.
+        """
+        remaining_clue = [clue for _, clue in self.constraints]
+        remaining_free = [len(unknown) for unknown, _ in self.constraints]
+        assignment = []
+        nodes = [0]
+        density = self.mines_left / len(self.cells) if self.cells else 0.0
+
+        def assign(var, value, sign):
+            for k in self.var_constraints[var]:
+                remaining_free[k] -= sign
+                if value:
+                    remaining_clue[k] -= sign
+
+        def consistent(var):
+            for k in self.var_constraints[var]:
+                if remaining_clue[k] < 0 or remaining_clue[k] > remaining_free[k]:
+                    return False
+            return True
+
+        def dfs(pos, mines):
+            nodes[0] += 1
+            if max_nodes is not None and nodes[0] > max_nodes:
+                raise _BudgetExceeded
+            if mines > self.mines_left:
+                return False
+            if pos == len(self.frontier):
+                return visit(assignment)
+            var = self.frontier[pos]
+            if var in fixed:
+                values = (fixed[var],)
+            elif rng is not None and rng.random() < density:
+                values = (True, False)
+            else:
+                values = (False, True)
+            for value in values:
+                assign(var, value, 1)
+                if consistent(var):
+                    assignment.append((var, value))
+                    stop = dfs(pos + 1, mines + value)
+                    assignment.pop()
+                    if stop:
+                        assign(var, value, -1)
+                        return True
+                assign(var, value, -1)
+            return False
+
+        try:
+            dfs(0, 0)
+        except _BudgetExceeded:
+            return False
+        return True
+
+    def sample(self, rng, fixed=None, max_nodes=20000):
+        """
+        Draws one mine layout consistent with every clue and the mine count.
+        Frontier cells come from a randomized backtracking search and the remaining mines are
+        spread uniformly over interior cells. This is approximately, not exactly, uniform
+        over consistent layouts, which is enough for sampling-based planners.
+        :param fixed: optional dict of cell index -> bool forcing cells safe or mined.
+        :return: set of mined cell indices, or None if no layout was found within the budget.
+        """
+        fixed = fixed or {}
+        interior = [i for i in self.interior if i not in fixed]
+        forced_interior = sum(1 for i in self.interior if fixed.get(i))
+        result = []
+
+        def visit(assignment):
+            frontier_mines = [var for var, value in assignment if value]
+            left = self.mines_left - len(frontier_mines) - forced_interior
+            if left < 0 or left > len(interior):
+                return False
+            mines = set(frontier_mines)
+            mines.update(i for i in self.interior if fixed.get(i))
+            mines.update(rng.sample(interior, left))
+            result.append(mines)
+            return True
+
+        self._search(rng, fixed, max_nodes, visit)
+        return result[0] if result else None
+
+    def enumerate(self, limit=5000, max_nodes=200000):
+        """
+        Lists every consistent layout as a bitmask over `self.cells`.
+        :return: list of int bitmasks, or None if there are more than `limit` layouts
+                 or the search exceeds `max_nodes`.
+        """
+        layouts = []
+        interior = self.interior
+
+        def visit(assignment):
+            mask = 0
+            count = 0
+            for var, value in assignment:
+                if value:
+                    mask |= 1 << var
+                    count += 1
+            left = self.mines_left - count
+            if left < 0 or left > len(interior):
+                return False
+            if len(layouts) + math.comb(len(interior), left) > limit:
+                raise _BudgetExceeded
+            for combo in itertools.combinations(interior, left):
+                m = mask
+                for i in combo:
+                    m |= 1 << i
+                layouts.append(m)
+            return False
+
+        complete = self._search(None, {}, max_nodes, visit)
+        return layouts if complete else None
+
+
+class _BudgetExceeded(Exception):
+    pass
@@ -0,0 +1,77 @@
+import copy
+from src.ai.actions import split_frontier
+from src.ai.certain_moves import certain_moves
+from src.ai.rule_based import RuleBasedAnalyzer
+
+
+def macro_actions(board, probabilities):
+    """
+    The composite action space used by the MDP macro mode, each macro being
+    ("macro", name, moves) with `moves` a tuple of primitive ("reveal" | "flag", x, y):
+    - "certain":  every safe reveal and mined flag the clues of `board` prove (see RuleBasedAnalyzer), at once,
+    - "frontier": the lowest-risk reveal next to a clue,
+    - "interior": the lowest-risk reveal away from clues, corners first,
+    - "info":     the reveal whose clue would constrain the most unknown cells, weighted by safety.
+    Macros with identical moves are proposed once.
+    """
+    def p_mine(c):
+        return probabilities.get((c.x, c.y), 0.5)
+
+    def unknown_neighbors(c):
+        return sum(1 for n in board.get_neighbors(c.x, c.y) if not n.revealed and not n.flagged)
+
+    macros = []
+    # `probabilities` is the root's map, whose certain cells the game loop's fast path has
+    # already played: the batch is deduced from this position's own clues instead
+    certain = certain_moves(RuleBasedAnalyzer().compute_probabilities(board))
+    if certain:
+        macros.append(("macro", "certain", tuple(certain)))
+
+    frontier, interior = split_frontier(board)
+    guesses = []
+    if frontier:
+        c = min(frontier, key=p_mine)
+        guesses.append(("frontier", c))
+    if interior:
+        c = min(interior, key=lambda c: (p_mine(c), len(board.get_neighbors(c.x, c.y))))
+        guesses.append(("interior", c))
+    candidates = frontier + interior
+    if candidates:
+        c = max(candidates, key=lambda c: ((1 - p_mine(c)) * unknown_neighbors(c), -p_mine(c)))
+        guesses.append(("info", c))
+
+    seen = {moves for _, _, moves in macros}
+    for name, c in guesses:
+        moves = (("reveal", c.x, c.y),)
+        if moves not in seen:
+            seen.add(moves)
+            macros.append(("macro", name, moves))
+    return macros
+
+
+def expand_action(action):
+    """Primitive moves making up an action (a primitive action expands to itself)."""
+    if action[0] == "macro":
+        return list(action[2])
+    return [action]
+
+
+def apply_action(gm, action):
+    """Plays a primitive or macro action through the game manager, stopping if the game ends."""
+    for act_type, x, y in expand_action(action):
+        if gm.is_over():
+            break
+        gm.make_move(x, y, act_type)
+
+
+def simulate_macro(board, action):
+    # Copy of the board after every primitive move of the macro
+    new_board = copy.deepcopy(board)
+    for act_type, x, y in action[2]:
+        if new_board.game_over:
+            break
+        if act_type == "reveal":
+            new_board.reveal_cell(x, y)
+        elif act_type == "flag":
+            new_board.flag_cell(x, y)
+    return new_board
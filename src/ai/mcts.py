@@ -0,0 +1,161 @@
+import math
+import random
+import time
+from src.ai.layouts import ConstraintModel, neighbor_indices
+
+
+class MCTSNode:
+    __slots__ = ("visits", "total", "children")
+
+    def __init__(self):
+        self.visits = 0
+        self.total = 0.0
+        self.children = {}  # action -> MCTSNode
+
+    def mean(self):
+        return self.total / self.visits if self.visits > 0 else 0.0
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search planner, a drop-in alternative to MDP.
+
+    Every iteration samples a hidden mine layout consistent with the current clues, walks
+    the tree with UCT over the reveals that are legal in that layout, expands one new node
+    and finishes with a cheap rollout. Rewards match MDP.action_reward: +1 per safe reveal,
+    -10 for hitting a mine. Planning cost is set by `iterations` and `time_limit` (seconds),
+    independently of the board size; `rollout_depth` caps the moves simulated per playout.
+    `depth`, the expectimax ply count the game loops pass to every planner, is not used.
+    The tree can be kept between moves with `advance` + `set_position`.
+    """
+    def __init__(self, board, probabilities, depth=None, iterations=500, time_limit=None,
+                 exploration=5.0, seed=None, rollout_depth=10):
+        self.initial_board = board
+        self.probabilities = probabilities
+        self.depth = depth
+        self.rollout_depth = rollout_depth
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.root = MCTSNode()
+
+    def set_position(self, board, probabilities):
+        """Point the planner at the current board and probabilities before the next search."""
+        self.initial_board = board
+        self.probabilities = probabilities
+
+    def advance(self, action):
+        """Re-root the tree onto the move actually played, keeping that subtree's statistics."""
+        child = self.root.children.get(action)
+        self.root = child if child is not None else MCTSNode()
+
+    def find_best_action(self):
+        board = self.initial_board
+        if board.game_over:
+            return None
+
+        width = board.width
+        n_cells = width * board.height
+        revealed = set()
+        flagged = set()
+        for row in board.grid:
+            for c in row:
+                if c.revealed:
+                    revealed.add(c.y * width + c.x)
+                elif c.flagged:
+                    flagged.add(c.y * width + c.x)
+        candidates = [i for i in range(n_cells) if i not in revealed and i not in flagged]
+        if not candidates:
+            return None
+
+        actions = [("reveal", i % width, i // width) for i in range(n_cells)]
+        p_mine = [self.probabilities.get((i % width, i // width), 0.5) for i in range(n_cells)]
+        model = ConstraintModel(board)
+        safe_total = n_cells - board.mines
+        neighbors = neighbor_indices(width, board.height)
+
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        for _ in range(self.iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            layout = model.sample(self.rng)
+            if layout is None:
+                break
+            mines = {model.cells[k][1] * width + model.cells[k][0] for k in layout}
+            self._playout(mines, revealed, flagged, actions, p_mine, neighbors, safe_total)
+
+        # Robust child: the most visited legal reveal, ties broken by mean return
+        visited = [(self.root.children[actions[i]], i) for i in candidates if actions[i] in self.root.children]
+        if not visited:
+            return actions[min(candidates, key=lambda i: p_mine[i])]
+        _, best = max(visited, key=lambda item: (item[0].visits, item[0].mean()))
+        return actions[best]
+
+    def _playout(self, mines, revealed, flagged, actions, p_mine, neighbors, safe_total):
+        revealed = set(revealed)
+        node = self.root
+        path = [node]
+        rewards = []
+        in_tree = True
+
+        for _ in range(self.rollout_depth):
+            legal = [i for i in range(len(actions)) if i not in revealed and i not in flagged]
+            if not legal or len(revealed) >= safe_total:
+                break
+            if in_tree:
+                untried = [i for i in legal if actions[i] not in node.children]
+                if untried:
+                    # Expand the least risky untried move, random among equals
+                    i = min(untried, key=lambda j: (p_mine[j], self.rng.random()))
+                    node.children[actions[i]] = MCTSNode()
+                    in_tree = False
+                else:
+                    i = self._select(node, legal, actions)
+                node = node.children[actions[i]]
+                path.append(node)
+            else:
+                i = self._rollout_move(legal, p_mine)
+
+            if i in mines:
+                rewards.append(-10.0)
+                break
+            self._reveal(i, mines, revealed, flagged, neighbors)
+            rewards.append(1.0)
+
+        # Node path[k] was reached by move k - 1 and is credited with the return from that move on
+        ret = 0.0
+        for k in range(len(rewards) - 1, -1, -1):
+            ret += rewards[k]
+            if k + 1 < len(path):
+                path[k + 1].visits += 1
+                path[k + 1].total += ret
+        self.root.visits += 1
+
+    def _select(self, node, legal, actions):
+        log_n = math.log(node.visits + 1)
+        best_score = -float('inf')
+        best = None
+        for i in legal:
+            child = node.children[actions[i]]
+            score = child.mean() + self.exploration * math.sqrt(log_n / (child.visits + 1e-9))
+            if score > best_score:
+                best_score = score
+                best = i
+        return best
+
+    def _rollout_move(self, legal, p_mine):
+        # Cheap default policy: safest of a few random candidates
+        picks = [self.rng.choice(legal) for _ in range(3)]
+        return min(picks, key=lambda i: p_mine[i])
+
+    def _reveal(self, i, mines, revealed, flagged, neighbors):
+        # Flood fill like Board.reveal_cell, on the sampled layout
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            if j in revealed or j in flagged:
+                continue
+            revealed.add(j)
+            if not any(k in mines for k in neighbors[j]):
+                stack.extend(k for k in neighbors[j] if k not in revealed)
@@ -1,21 +1,63 @@
 import copy
+import time
+from src.ai.actions import reduced_actions
+from src.ai.chance import outcome_rng, sample_reveal_outcomes
+from src.ai.macros import macro_actions, simulate_macro
+from src.ai.parallel import find_best_action_parallel
+from src.ai.transposition import TranspositionTable
+from src.game.zobrist import state_key
+
+# Per-ply reward bounds (reveal: at most +1, mine: -10; flag: 0 to 0.5) used for chance-node pruning
+REWARD_MIN = -10.0
+REWARD_MAX = 1.0
+
+
+class SearchTimeout(Exception):
+    pass
+
 
 class MDP:
-    def __init__(self, board, probabilities, depth=2):
+    def __init__(self, board, probabilities, depth=2, table_size=2 ** 16, reduce_actions=False, flag_threshold=0.7, workers=0,
+                 outcome_samples=0, seed=0, macros=False,
+                 time_limit=None, node_limit=None):
         self.initial_board = board
         self.probabilities = probabilities
         self.depth = depth
+        # Positions reached through different move orders share one entry
+        self.table = TranspositionTable(table_size)
+        # Group equivalent actions (frontier + one interior representative, risky flags only)
+        self.reduce_actions = reduce_actions
+        self.flag_threshold = flag_threshold
+        # With workers > 1 the root actions are searched across a process pool
+        self.workers = workers
+        # Optional SearchTree (see planner.py) caching successor boards across moves
+        self.tree = None
+        # With outcome_samples = K > 0 a safe reveal branches on K sampled clue outcomes
+        # (layouts consistent with the visible clues) instead of the true hidden value
+        self.outcome_samples = outcome_samples
+        self.seed = seed
+        # With macros the planner only chooses between composite actions (see macros.py)
+        self.macros = macros
+        # A certain batch can reveal many cells in one ply, so the per-ply bound grows with the board
+        self.reward_max = REWARD_MAX * board.width * board.height if macros else REWARD_MAX
+        # With a time or node budget, iterative deepening picks the depth (up to `depth`) per move.
+        # node_limit counts search() calls, so unlike time_limit it does not depend on machine load
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.completed_depth = 0
+        self.deadline = None
+        self.nodes = 0
+        self.node_budget = None
 
     def get_state(self, board):
-        # Encode state as a tuple of revealed/flagged info
-        state_repr = []
-        for y in range(board.height):
-            for x in range(board.width):
-                c = board.grid[y][x]
-                state_repr.append((c.revealed, c.flagged))
-        return tuple(state_repr)
+        # Encode state as the board's incremental Zobrist hash of revealed/flagged info
+        return state_key(board)
 
     def available_actions(self, board):
+        if self.macros:
+            return macro_actions(board, self.probabilities)
+        if self.reduce_actions:
+            return reduced_actions(board, self.probabilities, self.flag_threshold)
         actions = []
         for c in board.get_unrevealed_cells():
             actions.append(("reveal", c.x, c.y))
@@ -25,6 +67,8 @@ class MDP:
 
     def simulate_action(self, board, action):
         # Return a copy of the board after the action is applied
+        if action[0] == "macro":
+            return simulate_macro(board, action)
         new_board = copy.deepcopy(board)
         act_type, x, y = action
         if act_type == "reveal":
@@ -35,11 +79,37 @@ class MDP:
             new_board.flag_cell(x, y)
         return new_board
 
+    def successor(self, board, action):
+        if self.tree is None:
+            return self.simulate_action(board, action)
+        return self.tree.successor(board, action, self.simulate_action)
+
+    def simulate_safe_reveal(self, board, action):
+        # The reveal's successor with the cell marked safe (the mine outcome is valued separately)
+        _, x, y = action
+        new_board = self.simulate_action(board, ("reveal", x, y))
+        new_board.grid[y][x].has_mine = False
+        return new_board
+
+    def safe_successor(self, board, x, y):
+        # Own action key, so a cached board is never changed after it was stored
+        action = ("safe_reveal", x, y)
+        if self.tree is None:
+            return self.simulate_safe_reveal(board, action)
+        return self.tree.successor(board, action, self.simulate_safe_reveal)
+
+    def reveal_outcomes(self, board, x, y):
+        # [(weight, board)] for the sampled clue outcomes of safely revealing (x, y)
+        rng = outcome_rng(self.seed, board, x, y)
+        return sample_reveal_outcomes(board, x, y, self.outcome_samples, rng)
+
     def action_reward(self, board, action):
         # For reveal:
         # Reward = expected value: (1 - p_mine)*1 + p_mine*(-10)
         # For flag:
         # Reward = small neutral (0) since it's strategic not immediate.
+        if action[0] == "macro":
+            return sum(self.action_reward(board, move) for move in action[2])
         act_type, x, y = action
         p_mine = self.probabilities.get((x, y), 0.5)
         if act_type == "reveal":
@@ -48,11 +118,55 @@ class MDP:
             # Reward for flagging: reduce risk, enhance clarity
             return 0.5 if p_mine > 0.7 else 0.0
 
+    def action_value(self, board, action, depth):
+        # Value of taking `action` with `depth` plies left
+        if action[0] == "macro":
+            return self.macro_value(board, action, depth)
+        act_type, x, y = action
+        if act_type == "reveal":
+            p_mine = self.probabilities.get((x, y), 0.5)
+
+            # Handle stochastic outcomes for "reveal"
+            outcomes = self.reveal_outcomes(board, x, y) if self.outcome_samples else []
+            if outcomes:
+                # Branch on the sampled clue outcomes of a safe reveal
+                safe_value = sum(w * self.expectimax(child, depth - 1)[0] for w, child in outcomes)
+            else:
+                # Simulate safe reveal
+                safe_board = self.safe_successor(board, x, y)
+                safe_value, _ = self.expectimax(safe_board, depth - 1)
+
+            # A mine hit ends the game, so its value is known without simulating it
+            mine_value = -10  # Immediate loss value
+
+            # Expected value
+            total_value = (1 - p_mine) * (self.action_reward(board, action) + safe_value) + p_mine * mine_value
+        else:
+            # "flag" is deterministic
+            new_board = self.successor(board, action)
+            value, _ = self.expectimax(new_board, depth - 1)
+            total_value = self.action_reward(board, action) + value
+        return total_value
+
+    def macro_value(self, board, action, depth):
+        # A single guess is valued like the primitive reveal; the certain batch is deterministic
+        moves = action[2]
+        if len(moves) == 1:
+            return self.action_value(board, moves[0], depth)
+        new_board = self.successor(board, action)
+        value, _ = self.expectimax(new_board, depth - 1)
+        return self.action_reward(board, action) + value
+
     def expectimax(self, board, depth):
         if depth == 0 or board.game_over or board.is_victory():
             # Terminal state or depth limit
             return 0.0, None
 
+        state = self.get_state(board)
+        cached = self.table.lookup(state, depth)
+        if cached is not None:
+            return cached
+
         actions = self.available_actions(board)
         if not actions:
             return 0.0, None
@@ -61,36 +175,161 @@ class MDP:
         best_action = None
 
         for action in actions:
-            act_type, x, y = action
-            if act_type == "reveal":
-                p_mine = self.probabilities.get((x, y), 0.5)
+            total_value = self.action_value(board, action, depth)
+            if total_value > best_value:
+                best_value = total_value
+                best_action = action
 
-                # Handle stochastic outcomes for "reveal"
-                # Simulate safe reveal
-                safe_board = self.simulate_action(board, action)
-                safe_board.grid[y][x].has_mine = False
-                safe_value, _ = self.expectimax(safe_board, depth - 1)
+        self.table.store(state, depth, best_value, best_action)
+        return best_value, best_action
 
-                # Simulate mine hit
-                mine_board = self.simulate_action(board, action)
-                mine_board.grid[y][x].has_mine = True
-                mine_board.game_over = True
-                mine_value = -10  # Immediate loss value
+    def ordered_actions(self, board):
+        # Move ordering: best immediate reward first (safest reveals, then likely-mine flags)
+        return sorted(self.available_actions(board), key=lambda a: -self.action_reward(board, a))
 
-                # Expected value
-                total_value = (1 - p_mine) * (self.action_reward(board, action) + safe_value) + p_mine * mine_value
-            else:
-                # "flag" is deterministic
-                new_board = self.simulate_action(board, action)
-                value, _ = self.expectimax(new_board, depth - 1)
-                total_value = self.action_reward(board, action) + value
+    def bounded_action_value(self, board, action, depth, alpha, beta):
+        """
+        Like action_value, but may stop early once the value is proven to be <= alpha or
+        >= beta, returning that bound instead (fail-hard).
+        Star1: the unexplored safe outcome of a reveal is bounded by [depth-1 plies of
+        REWARD_MIN, REWARD_MAX], so the chance node is pruned before any search if even
+        the optimistic bound cannot beat alpha (or the pessimistic one already reaches beta).
+        Star2: the safe successor is then searched with the window translated through the
+        chance node, so its first (best-ordered) reply acts as a probe that proves a cutoff.
+        """
+        if action[0] == "macro" and len(action[2]) == 1:
+            return self.bounded_action_value(board, action[2][0], depth, alpha, beta)
+        act_type, x, y = action
+        reward = self.action_reward(board, action)
+        if act_type in ("flag", "macro"):
+            new_board = self.successor(board, action)
+            value, _ = self.search(new_board, depth - 1, alpha - reward, beta - reward)
+            return reward + value
 
-            if total_value > best_value:
-                best_value = total_value
+        p_mine = self.probabilities.get((x, y), 0.5)
+        mine_term = p_mine * -10
+        p_safe = 1 - p_mine
+        if p_safe <= 0:
+            return mine_term
+
+        upper = p_safe * (reward + self.reward_max * (depth - 1)) + mine_term
+        if upper <= alpha:
+            return upper
+        lower = p_safe * (reward + REWARD_MIN * (depth - 1)) + mine_term
+        if lower >= beta:
+            return lower
+
+        child_alpha = (alpha - mine_term) / p_safe - reward
+        child_beta = (beta - mine_term) / p_safe - reward
+        outcomes = self.reveal_outcomes(board, x, y) if self.outcome_samples else []
+        if outcomes:
+            safe_value = self.bounded_expectation(outcomes, depth - 1, child_alpha, child_beta)
+        else:
+            safe_board = self.safe_successor(board, x, y)
+            safe_value, _ = self.search(safe_board, depth - 1, child_alpha, child_beta)
+        return p_safe * (reward + safe_value) + mine_term
+
+    def bounded_expectation(self, outcomes, depth, alpha, beta):
+        """
+        Star1 over sampled outcomes: after each child, the unexplored weight is bounded by
+        the per-ply reward bounds; stop as soon as the expectation is proven outside (alpha, beta).
+        """
+        lower, upper = REWARD_MIN * depth, self.reward_max * depth
+        done = 0.0
+        rest = 1.0
+        for w, child in outcomes:
+            rest -= w
+            child_alpha = (alpha - done - rest * upper) / w
+            child_beta = (beta - done - rest * lower) / w
+            value, _ = self.search(child, depth, child_alpha, child_beta)
+            done += w * value
+            if done + rest * upper <= alpha:
+                return done + rest * upper
+            if done + rest * lower >= beta:
+                return done + rest * lower
+        return done
+
+    def search(self, board, depth, alpha=-float('inf'), beta=float('inf')):
+        """
+        Expectimax with Star1/Star2 chance-node pruning inside the (alpha, beta) window.
+        Returns the exact value when it lies strictly inside the window, otherwise a bound.
+        """
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchTimeout
+        if depth == 0 or board.game_over or board.is_victory():
+            return 0.0, None
+
+        state = self.get_state(board)
+        cached = self.table.lookup(state, depth)
+        if cached is not None:
+            return cached
+
+        actions = self.ordered_actions(board)
+        if not actions:
+            return 0.0, None
+
+        best_value = -float('inf')
+        best_action = None
+        for action in actions:
+            value = self.bounded_action_value(board, action, depth, max(alpha, best_value), beta)
+            if value > best_value:
+                best_value = value
                 best_action = action
+            if best_value >= beta:
+                break
 
+        # Only exact values are shared; bounds depend on the window they were searched with
+        if alpha < best_value < beta:
+            self.table.store(state, depth, best_value, best_action)
         return best_value, best_action
 
+    def iterative_deepening(self):
+        """
+        Searches depth 1, 2, ... up to `self.depth` until `self.time_limit` or `self.node_limit`
+        (search nodes over all iterations) runs out and returns the best action of the deepest
+        completed iteration. Root moves are re-ordered
+        by the previous iteration's scores; the transposition table carries over between them.
+        """
+        board = self.initial_board
+        start = time.perf_counter()
+        best_action = None
+        scores = {}
+        self.completed_depth = 0
+        self.nodes = 0
+        if board.game_over or board.is_victory():
+            return None
+        for depth in range(1, self.depth + 1):
+            # Depth 1 always completes so there is a move to return
+            if depth > 1:
+                self.deadline = start + self.time_limit if self.time_limit is not None else None
+                self.node_budget = self.node_limit
+            actions = self.ordered_actions(board)
+            if not actions:
+                break
+            actions.sort(key=lambda a: -scores.get(a, -float('inf')))
+            try:
+                best_value = -float('inf')
+                iteration_best = None
+                iteration_scores = {}
+                for action in actions:
+                    value = self.bounded_action_value(board, action, depth, best_value, float('inf'))
+                    iteration_scores[action] = value
+                    if value > best_value:
+                        best_value = value
+                        iteration_best = action
+            except SearchTimeout:
+                break
+            finally:
+                self.deadline = None
+                self.node_budget = None
+            best_action = iteration_best
+            scores = iteration_scores
+            self.completed_depth = depth
+        return best_action
+
     def update_probabilities(self, board):
         # Dynamic update of probabilities based on the current board state
         for y in range(board.height):
@@ -103,12 +342,16 @@ class MDP:
                     if revealed_neighbors:
                         clue_mines = sum(n.neighbor_mines for n in revealed_neighbors)
                         clue_flags = sum(1 for n in neighbors if n.flagged)
-                        self.probabilities[(x, y)] = max(0.0, (clue_mines - clue_flags) / len(neighbors))
+                        self.probabilities[(x, y)] = min(1.0, max(0.0, (clue_mines - clue_flags) / len(neighbors)))
                     else:
                         self.probabilities[(x, y)] = 0.5
 
     def find_best_action(self):
         self.update_probabilities(self.initial_board)
+        if self.time_limit is not None or self.node_limit is not None:
+            return self.iterative_deepening()
+        if self.workers > 1:
+            return find_best_action_parallel(self, self.workers)
         _, action = self.expectimax(self.initial_board, self.depth)
         return action
 
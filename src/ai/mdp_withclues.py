@@ -1,21 +1,42 @@
 import copy
+from src.ai.actions import reduced_actions
+from src.ai.chance import outcome_rng, sample_reveal_outcomes
+from src.ai.macros import macro_actions, simulate_macro
+from src.ai.parallel import find_best_action_parallel
+from src.ai.transposition import TranspositionTable
+from src.game.zobrist import state_key
 
 class MDP:
-    def __init__(self, board, probabilities, depth=2):
+    def __init__(self, board, probabilities, depth=2, table_size=2 ** 16, reduce_actions=False, flag_threshold=0.7, workers=0,
+                 outcome_samples=0, seed=0, macros=False):
         self.initial_board = board
         self.probabilities = probabilities
         self.depth = depth
+        # Positions reached through different move orders share one entry
+        self.table = TranspositionTable(table_size)
+        # Group equivalent actions (frontier + one interior representative, risky flags only)
+        self.reduce_actions = reduce_actions
+        self.flag_threshold = flag_threshold
+        # With workers > 1 the root actions are searched across a process pool
+        self.workers = workers
+        # Optional SearchTree (see planner.py) caching successor boards across moves
+        self.tree = None
+        # With outcome_samples = K > 0 a safe reveal branches on K sampled clue outcomes
+        # (layouts consistent with the visible clues) instead of the true hidden value
+        self.outcome_samples = outcome_samples
+        self.seed = seed
+        # With macros the planner only chooses between composite actions (see macros.py)
+        self.macros = macros
 
     def get_state(self, board):
-        # Encode state as a tuple of revealed/flagged info
-        state_repr = []
-        for y in range(board.height):
-            for x in range(board.width):
-                c = board.grid[y][x]
-                state_repr.append((c.revealed, c.flagged))
-        return tuple(state_repr)
+        # Encode state as the board's incremental Zobrist hash of revealed/flagged info
+        return state_key(board)
 
     def available_actions(self, board):
+        if self.macros:
+            return macro_actions(board, self.probabilities)
+        if self.reduce_actions:
+            return reduced_actions(board, self.probabilities, self.flag_threshold)
         # Generate all possible actions based on unrevealed cells
         actions = []
         for c in board.get_unrevealed_cells():
@@ -25,6 +46,8 @@ class MDP:
 
     def simulate_action(self, board, action):
         # Return a copy of the board after the action is applied
+        if action[0] == "macro":
+            return simulate_macro(board, action)
         new_board = copy.deepcopy(board)
         act_type, x, y = action
         if act_type == "reveal":
@@ -33,6 +56,16 @@ class MDP:
             new_board.flag_cell(x, y)
         return new_board
 
+    def successor(self, board, action):
+        if self.tree is None:
+            return self.simulate_action(board, action)
+        return self.tree.successor(board, action, self.simulate_action)
+
+    def reveal_outcomes(self, board, x, y):
+        # [(weight, board)] for the sampled clue outcomes of safely revealing (x, y)
+        rng = outcome_rng(self.seed, board, x, y)
+        return sample_reveal_outcomes(board, x, y, self.outcome_samples, rng)
+
     def action_reward(self, board, action):
         """
         Reward based on probabilities and clues.
@@ -41,6 +74,8 @@ class MDP:
         - Revealing a clue cell: Higher reward proportional to its usefulness.
         - Flagging: Small neutral reward (strategic action).
         """
+        if action[0] == "macro":
+            return sum(self.action_reward(board, move) for move in action[2])
         act_type, x, y = action
         p_mine = self.probabilities.get((x, y), 0.5)
         cell = board.grid[y][x]
@@ -59,6 +94,37 @@ class MDP:
             # Small reward for strategic advantage
             return 0.1
 
+    def action_value(self, board, action, depth):
+        """
+        Immediate reward plus the expectimax value of the resulting board.
+        Flag actions are deterministic; reveal actions incorporate stochastic outcomes via probabilities.
+        """
+        if action[0] == "macro":
+            return self.macro_value(board, action, depth)
+        act_type, x, y = action
+        if act_type == "reveal" and self.outcome_samples and not board.grid[y][x].revealed:
+            outcomes = self.reveal_outcomes(board, x, y)
+            if outcomes:
+                # Clue bonus and future value come from the sampled clue, not the hidden one
+                p_mine = self.probabilities.get((x, y), 0.5)
+                safe_value = sum(
+                    w * (1 + child.grid[y][x].neighbor_mines + self.expectimax(child, depth - 1)[0])
+                    for w, child in outcomes
+                )
+                return (1 - p_mine) * safe_value + p_mine * (-10)
+        new_board = self.successor(board, action)
+        value, _ = self.expectimax(new_board, depth - 1)
+        return self.action_reward(board, action) + value
+
+    def macro_value(self, board, action, depth):
+        # A single guess is valued like the primitive reveal; the certain batch is deterministic
+        moves = action[2]
+        if len(moves) == 1:
+            return self.action_value(board, moves[0], depth)
+        new_board = self.successor(board, action)
+        value, _ = self.expectimax(new_board, depth - 1)
+        return self.action_reward(board, action) + value
+
     def expectimax(self, board, depth):
         """
         Expectimax algorithm with probabilistic consideration of mines and clues.
@@ -67,6 +133,11 @@ class MDP:
         if depth == 0 or board.game_over or board.is_victory():
             return 0.0, None
 
+        state = self.get_state(board)
+        cached = self.table.lookup(state, depth)
+        if cached is not None:
+            return cached
+
         actions = self.available_actions(board)
         if not actions:
             return 0.0, None
@@ -75,22 +146,12 @@ class MDP:
         best_action = None
 
         for action in actions:
-            # Simulate the action
-            new_board = self.simulate_action(board, action)
-
-            if action[0] == "flag":
-                # Flag action is deterministic
-                value, _ = self.expectimax(new_board, depth - 1)
-                total_value = self.action_reward(board, action) + value
-            else:  # Reveal action
-                # "reveal" incorporates stochastic outcomes via probabilities
-                value, _ = self.expectimax(new_board, depth - 1)
-                total_value = self.action_reward(board, action) + value
-
+            total_value = self.action_value(board, action, depth)
             if total_value > best_value:
                 best_value = total_value
                 best_action = action
 
+        self.table.store(state, depth, best_value, best_action)
         return best_value, best_action
 
     def find_best_action(self):
@@ -99,5 +160,7 @@ class MDP:
         Returns:
             tuple: The best action as (action_type, x, y).
         """
+        if self.workers > 1:
+            return find_best_action_parallel(self, self.workers)
         _, action = self.expectimax(self.initial_board, self.depth)
         return action
@@ -0,0 +1,145 @@
+import json
+import math
+import os
+from src.game.presets import PRESETS
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(__file__), "opening_book.json")
+
+# path -> (modification time, OpeningBook): every game loads the book, each process parses it once
+_LOADED = {}
+
+
+def preset_key(width, height, mines):
+    return f"{width}x{height}x{mines}"
+
+
+class OpeningBook:
+    """
+    Precomputed first and second moves per (width, height, mines) configuration.
+
+    The first move is played on an untouched board. The second move is looked up when the
+    first reveal opened exactly one cell, keyed by that cell and the clue it shows
+    ("x,y:clue"); any other position is left to the planner.
+    """
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_BOOK_PATH):
+        """The book stored at `path` (empty if there is none), shared until the file changes."""
+        if not os.path.exists(path):
+            return cls()
+        mtime = os.path.getmtime(path)
+        cached = _LOADED.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path) as f:
+                cached = (mtime, cls(json.load(f)))
+            _LOADED[path] = cached
+        return cached[1]
+
+    def save(self, path=DEFAULT_BOOK_PATH):
+        with open(path, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+            f.write("\n")
+
+    def lookup(self, board):
+        """
+        :return: ("reveal", x, y) from the book, or None if the position is not covered.
+        """
+        entry = self.entries.get(preset_key(board.width, board.height, board.mines))
+        if entry is None:
+            return None
+        revealed = [c for row in board.grid for c in row if c.revealed]
+        if any(c.flagged for row in board.grid for c in row):
+            return None
+        if not revealed:
+            x, y = entry["first"]
+            return ("reveal", x, y)
+        if len(revealed) == 1 and not revealed[0].has_mine:
+            c = revealed[0]
+            move = entry["second"].get(f"{c.x},{c.y}:{c.neighbor_mines}")
+            if move is not None:
+                return ("reveal", move[0], move[1])
+        return None
+
+
+def _neighbors(x, y, width, height):
+    return {
+        (nx, ny)
+        for nx in (x - 1, x, x + 1)
+        for ny in (y - 1, y, y + 1)
+        if 0 <= nx < width and 0 <= ny < height and not (nx == x and ny == y)
+    }
+
+
+def _ratio(n, k, total_n, total_k):
+    # C(n, k) / C(total_n, total_k), 0 when impossible
+    if k < 0 or k > n or total_k < 0 or total_k > total_n:
+        return 0.0
+    return math.comb(n, k) / math.comb(total_n, total_k)
+
+
+def best_first_move(width, height, mines):
+    """
+    The cell with the highest chance of opening (itself and all neighbors safe) under
+    uniform mine placement, which for every preset is a corner. Ties go to board order.
+    :return: ((x, y), opening_probability)
+    """
+    total = width * height
+    best = None
+    for y in range(height):
+        for x in range(width):
+            area = len(_neighbors(x, y, width, height)) + 1
+            p_open = _ratio(total - area, mines, total, mines)
+            if best is None or p_open > best[1]:
+                best = ((x, y), p_open)
+    return best
+
+
+def best_second_move(width, height, mines, first, clue):
+    """
+    Best reveal after `first` showed `clue` and opened nothing else: the lowest mine
+    probability, ties broken by the highest chance of opening. All probabilities are exact:
+    the `clue` mines are uniform over first's neighbors, the rest over the remaining cells.
+    """
+    around = _neighbors(*first, width, height)
+    n = len(around)
+    if clue > n or clue > mines:
+        return None
+    rest = width * height - 1 - n
+    rest_mines = mines - clue
+    best = None
+    for y in range(height):
+        for x in range(width):
+            if (x, y) == first:
+                continue
+            p_mine = clue / n if (x, y) in around else rest_mines / rest
+            area = _neighbors(x, y, width, height) | {(x, y)}
+            inside = len(area & around)
+            outside = len(area - around - {first})
+            p_open = (_ratio(n - inside, clue, n, clue)
+                      * _ratio(rest - outside, rest_mines, rest, rest_mines))
+            score = (p_mine, -p_open)
+            if best is None or score < best[1]:
+                best = ((x, y), score)
+    return best[0]
+
+
+def build_opening_book(presets=PRESETS):
+    """Batch job: computes the book for every preset."""
+    entries = {}
+    for width, height, mines in presets.values():
+        first, _ = best_first_move(width, height, mines)
+        second = {}
+        for clue in range(1, len(_neighbors(*first, width, height)) + 1):
+            move = best_second_move(width, height, mines, first, clue)
+            if move is not None:
+                second[f"{first[0]},{first[1]}:{clue}"] = list(move)
+        entries[preset_key(width, height, mines)] = {"first": list(first), "second": second}
+    return OpeningBook(entries)
+
+
+if __name__ == "__main__":
+    book = build_opening_book()
+    book.save()
+    print(f"Wrote {len(book.entries)} presets to {DEFAULT_BOOK_PATH}")
@@ -0,0 +1,70 @@
+import atexit
+import copy
+from concurrent.futures import ProcessPoolExecutor
+from src.ai.transposition import TranspositionTable
+from src.game.snapshot import snapshot_board, restore_board
+
+_EXECUTORS = {}
+
+
+def get_executor(workers):
+    """Returns a process pool of the given size, created once and reused across moves."""
+    if workers not in _EXECUTORS:
+        _EXECUTORS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _EXECUTORS[workers]
+
+
+def shutdown_executors():
+    """Stops the shared process pools and their workers; called at interpreter exit."""
+    while _EXECUTORS:
+        _, executor = _EXECUTORS.popitem()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
+
+
+def _evaluate_actions(mdp, snapshot, actions):
+    # Runs in a worker: rebuild the board and score a share of the root actions
+    board = restore_board(snapshot)
+    mdp.initial_board = board
+    return [mdp.action_value(board, action, mdp.depth) for action in actions]
+
+
+def find_best_action_parallel(mdp, workers, executor=None):
+    """
+    Root-parallel expectimax: the root actions of `mdp` are split round-robin across a
+    process pool, each worker searches its share from a compact board snapshot, and the
+    values are reduced in the original action order with the same strict tie-breaking as
+    `mdp.expectimax`, so the chosen action is identical to the serial search.
+    """
+    board = mdp.initial_board
+    if mdp.depth == 0 or board.game_over or board.is_victory():
+        return None
+    actions = mdp.available_actions(board)
+    if not actions:
+        return None
+
+    # Workers get a detached copy: no Cell graph or tree, an empty table, no nested parallelism
+    worker_mdp = copy.copy(mdp)
+    worker_mdp.initial_board = None
+    worker_mdp.table = TranspositionTable(mdp.table.size)
+    worker_mdp.workers = 0
+    worker_mdp.tree = None
+
+    executor = executor or get_executor(workers)
+    snapshot = snapshot_board(board)
+    chunks = [actions[k::workers] for k in range(workers) if actions[k::workers]]
+    futures = [executor.submit(_evaluate_actions, worker_mdp, snapshot, chunk) for chunk in chunks]
+
+    values = {}
+    for chunk, future in zip(chunks, futures):
+        values.update(zip(chunk, future.result()))
+
+    best_value = -float('inf')
+    best_action = None
+    for action in actions:
+        if values[action] > best_value:
+            best_value = values[action]
+            best_action = action
+    return best_action
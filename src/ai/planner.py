@@ -0,0 +1,155 @@
+import sys
+from src.ai.endgame import EndgameSolver
+from src.game.zobrist import state_key
+
+
+def board_nbytes(board):
+    """Approximate memory of a board: the object, its grid rows and its cells with their attributes."""
+    size = sys.getsizeof(board) + sys.getsizeof(board.__dict__) + sys.getsizeof(board.grid)
+    for row in board.grid:
+        size += sys.getsizeof(row)
+        for c in row:
+            size += sys.getsizeof(c) + (sys.getsizeof(c.__dict__) if hasattr(c, "__dict__") else 0)
+    return size
+
+
+class SearchTree:
+    """
+    Successor boards produced by the MDP search, cached by Zobrist state so the
+    (deep-copied) positions explored for one move can be reused for the next.
+    Boards are whole Cell graphs, so the cache is bounded by their estimated size in bytes
+    (`max_bytes`, 0 stores nothing) rather than by their number.
+    """
+    def __init__(self, max_bytes=0):
+        self.max_bytes = max_bytes
+        self.children = {}  # state -> {action: child state}
+        self.boards = {}    # state -> board
+        self.board_bytes = None  # Estimated size of one board, measured on the first one stored
+        self.hits = 0
+
+    def successor(self, board, action, simulate):
+        """Returns the board after `action`, from the cache when this transition was seen before."""
+        parent = state_key(board)
+        edges = self.children.get(parent)
+        child = edges.get(action) if edges is not None else None
+        if child is not None and child in self.boards:
+            self.hits += 1
+            return self.boards[child]
+
+        new_board = simulate(board, action)
+        if self.board_bytes is None:
+            self.board_bytes = board_nbytes(new_board)
+        if self.nbytes() + self.board_bytes <= self.max_bytes:
+            child = state_key(new_board)
+            self.children.setdefault(parent, {})[action] = child
+            self.boards[child] = new_board
+        return new_board
+
+    def nbytes(self):
+        """Estimated memory held by the cached boards."""
+        return len(self.boards) * (self.board_bytes or 0)
+
+    def reroot(self, board):
+        """
+        Keeps only the part of the tree reachable from the real board's state; every
+        branch the actual outcome ruled out is dropped.
+        """
+        root = state_key(board)
+        if root not in self.children:
+            self.clear()
+            return
+        reachable = {root}
+        stack = [root]
+        while stack:
+            for child in self.children.get(stack.pop(), {}).values():
+                if child not in reachable:
+                    reachable.add(child)
+                    stack.append(child)
+        self.children = {s: e for s, e in self.children.items() if s in reachable}
+        self.boards = {s: b for s, b in self.boards.items() if s in reachable}
+
+    def clear(self):
+        self.children = {}
+        self.boards = {}
+
+    def __len__(self):
+        return len(self.boards)
+
+
+class PersistentPlanner:
+    """
+    Long-lived wrapper around an MDP class that carries search work across moves.
+
+    The transposition table is kept whenever the search probabilities did not change, since
+    its values are only valid for one probability map. With `tree_bytes` > 0 the successor
+    boards of the previous search are also kept in a SearchTree of that size and re-rooted
+    after every real move. It is off by default: in measured classic, withclues and sj games
+    it saved no time over copying the boards afresh, and each cached board is a deep copy.
+    Once at most `endgame_threshold` cells are unknown, the exact EndgameSolver takes over
+    from the MDP (0 disables it). Planner classes with `set_position` (MCTS) are instead built
+    once per game and re-rooted onto every move played, keeping their search statistics.
+
+    Usage per game:
+        planner = PersistentPlanner(MDP, depth=2, reduce_actions=True)
+        action = planner.find_best_action(board, probabilities)
+        gm.make_move(x, y, act_type)
+        planner.advance(board, [(act_type, x, y)])
+    """
+    def __init__(self, mdp_class, depth=2, tree_bytes=0, endgame_threshold=20, **options):
+        self.mdp_class = mdp_class
+        self.depth = depth
+        self.options = options
+        self.tree = SearchTree(tree_bytes)
+        self.table = None
+        self.table_probabilities = None
+        self.endgame = EndgameSolver(max_unknown=endgame_threshold) if endgame_threshold > 0 else None
+        self.search = None   # The kept planner instance of classes with set_position
+        self.last_nodes = 0  # Positions expanded by the last search (table misses / endgame states / playouts)
+
+    def find_best_action(self, board, probabilities):
+        if self.endgame is not None:
+            action = self.endgame.find_best_action(board)
+            if action is not None:
+                self.last_nodes = len(self.endgame.memo)
+                return action
+
+        if hasattr(self.mdp_class, "set_position"):
+            if self.search is None:
+                self.search = self.mdp_class(board, probabilities, self.depth, **self.options)
+            else:
+                self.search.set_position(board, probabilities)
+            playouts = self.search.root.visits
+            action = self.search.find_best_action()
+            self.last_nodes = self.search.root.visits - playouts
+            return action
+
+        mdp = self.mdp_class(board, probabilities, self.depth, **self.options)
+        if hasattr(mdp, "update_probabilities"):
+            # Variants that rewrite their probabilities (mdp_sj) do so before the comparison below
+            mdp.update_probabilities(board)
+        if self.table is not None and mdp.probabilities == self.table_probabilities:
+            mdp.table = self.table
+        if self.tree.max_bytes > 0:
+            mdp.tree = self.tree
+        misses = mdp.table.misses if getattr(mdp, "table", None) is not None else 0
+        action = mdp.find_best_action()
+        # Planners without a transposition table (VectorizedGreedy) simply start fresh
+        self.table = getattr(mdp, "table", None)
+        self.last_nodes = self.table.misses - misses if self.table is not None else 0
+        self.table_probabilities = dict(mdp.probabilities)
+        return action
+
+    def advance(self, board, moves=None):
+        """
+        Call after the chosen move (or a batch of certain moves) was applied to `board`, with
+        `moves` the primitive moves played. A kept search is re-rooted onto the reveals among
+        them, or dropped when the moves are not given.
+        """
+        self.tree.reroot(board)
+        if self.search is not None:
+            if moves is None:
+                self.search = None
+                return
+            for move in moves:
+                if move[0] == "reveal":
+                    self.search.advance(move)
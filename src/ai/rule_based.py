@@ -0,0 +1,149 @@
+from src.ai.layouts import neighbor_indices
+
+
+class RuleBasedAnalyzer:
+    """
+    Cheap drop-in for BayesianAnalyzer: deduces certain cells with simple local rules
+    and estimates everything else from clue ratios and the remaining mine density.
+
+    Rules, applied until nothing changes:
+    - single clue: if a clue's known mines already match it, its other unknown neighbors
+      are safe; if its unknown neighbors are exactly the missing mines, they are all mines;
+    - subset: if one clue's unknown cells are a subset of another's, the difference holds
+      the difference of their remaining mine counts.
+    Flagged cells are trusted as mines.
+    """
+    def __init__(self):
+        self.last = (0, 0, {})  # width, height and probabilities of the last board
+
+    @property
+    def probability_matrix(self):
+        # Built on demand: the game loops only need it for printing
+        width, height, probabilities = self.last
+        return [[probabilities.get((x, y), 0.0) for x in range(width)] for y in range(height)]
+
+    def compute_probabilities(self, board):
+        width = board.width
+        # Flat cell indices (y * width + x) with the board size's cached neighbor lists
+        cells = [c for row in board.grid for c in row]
+        neighbors = neighbor_indices(width, board.height)
+        unknown = [i for i, c in enumerate(cells) if not c.revealed and not c.flagged]
+        if not unknown:
+            return {}
+
+        mines = {i for i, c in enumerate(cells) if c.flagged}
+        safe = set()
+        revealed = {i for i, c in enumerate(cells) if c.revealed}
+        # Only clues next to a hidden cell can constrain anything: (hidden neighbors, clue)
+        clues = []
+        for i, c in enumerate(cells):
+            if c.revealed and not c.has_mine:
+                around = [n for n in neighbors[i] if n not in revealed]
+                if around:
+                    clues.append((around, c.neighbor_mines))
+
+        changed = True
+        while changed:
+            changed = False
+            constraints = []
+            for around, clue in clues:
+                open_cells = set()
+                known = 0
+                for n in around:
+                    if n in safe:
+                        continue
+                    if n in mines:
+                        known += 1
+                    else:
+                        open_cells.add(n)
+                if open_cells:
+                    constraints.append((frozenset(open_cells), clue - known))
+
+            for group, left in constraints:
+                if left == 0:
+                    safe |= group
+                    changed = True
+                elif left == len(group):
+                    mines |= group
+                    changed = True
+            if changed:
+                continue
+
+            for a, left_a in constraints:
+                for b, left_b in constraints:
+                    if a is b or not a < b:
+                        continue
+                    diff = b - a
+                    if left_b - left_a == 0:
+                        safe |= diff
+                        changed = True
+                    elif left_b - left_a == len(diff):
+                        mines |= diff
+                        changed = True
+                if changed:
+                    break
+
+        # Estimates for the cells no rule decided
+        undecided = [i for i in unknown if i not in safe and i not in mines]
+        mines_left = board.mines - len(mines)
+        density = mines_left / len(undecided) if undecided else 0.0
+        local = {}
+        for group, left in constraints:
+            ratio = left / len(group)
+            for i in group:
+                local[i] = max(local.get(i, 0.0), ratio)
+
+        probabilities = {}
+        for i in unknown:
+            if i in safe:
+                p = 0.0
+            elif i in mines:
+                p = 1.0
+            else:
+                p = min(1.0, max(0.0, local.get(i, density)))
+            probabilities[(i % width, i // width)] = p
+
+        self.last = (width, board.height, probabilities)
+        return probabilities
+
+    def print_probability_matrix(self):
+        """Print the probability matrix in a readable format."""
+        for row in self.probability_matrix:
+            print(" | ".join([f"{prob:.2f}" for prob in row]))
+
+
+class RuleBasedPolicy:
+    """
+    Baseline planner with the MDP interface: play a certain move if there is one,
+    otherwise reveal the least likely mine, preferring corners, then edges, then board order
+    (cells with fewer neighbors open up more often).
+    """
+    def __init__(self, board, probabilities, depth=0):
+        self.initial_board = board
+        self.probabilities = probabilities
+        self.depth = depth
+        # No search state; present so PersistentPlanner can wrap this like an MDP
+        self.table = None
+        self.tree = None
+
+    def find_best_action(self):
+        board = self.initial_board
+        candidates = board.get_unrevealed_cells()
+        if not candidates or board.game_over:
+            return None
+
+        flag = None
+        guess = None
+        guess_key = None
+        for c in candidates:
+            p = self.probabilities.get((c.x, c.y), 0.5)
+            if p <= 0.0:
+                return ("reveal", c.x, c.y)
+            if p >= 1.0:
+                if flag is None:
+                    flag = ("flag", c.x, c.y)
+                continue
+            key = (p, len(board.get_neighbors(c.x, c.y)))
+            if guess_key is None or key < guess_key:
+                guess, guess_key = ("reveal", c.x, c.y), key
+        return flag or guess
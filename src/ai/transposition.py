@@ -0,0 +1,37 @@
+class TranspositionTable:
+    """
+    Bounded cache of expectimax results keyed by Zobrist state hashes.
+    Each hash maps to a single slot (key % size); on a collision the entry searched
+    to the greater remaining depth is kept, since it represents more work.
+    """
+    def __init__(self, size=2 ** 16):
+        self.size = size
+        self.slots = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, depth):
+        """
+        :return: (value, action) stored for this exact state and remaining depth, or None.
+        """
+        entry = self.slots.get(key % self.size)
+        if entry is not None and entry[0] == key and entry[1] == depth:
+            self.hits += 1
+            return entry[2], entry[3]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value, action):
+        index = key % self.size
+        entry = self.slots.get(index)
+        # Depth-preferred replacement: never evict a deeper result for a shallower one
+        if entry is None or depth >= entry[1]:
+            self.slots[index] = (key, depth, value, action)
+
+    def clear(self):
+        self.slots.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.slots)
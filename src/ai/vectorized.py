@@ -0,0 +1,98 @@
+import weakref
+
+import numpy as np
+
+# Reward settings reproducing the depth-1 decision of each MDP module
+VARIANTS = {
+    # mdp.py: reveal = (1 - p) - 10p, flag = 0
+    "mdp": {"clue_bonus": False, "chance_reveal": False, "flag_reward": 0.0, "flag_threshold": None},
+    # mdp_sj.py: safe branch weighted by (1 - p) again, flag = 0.5 above p = 0.7
+    "sj": {"clue_bonus": False, "chance_reveal": True, "flag_reward": 0.5, "flag_threshold": 0.7},
+    # mdp_withclues.py: clue bonus (1 + clue) on safe reveals, flag = 0.1
+    "withclues": {"clue_bonus": True, "chance_reveal": False, "flag_reward": 0.1, "flag_threshold": None},
+}
+
+
+# board -> [state hash, clue, cells, candidates]; the clue array only depends on the layout and the
+# candidates mask is rebuilt only when the board's Zobrist hash says a cell was revealed or flagged
+_ARRAYS = weakref.WeakKeyDictionary()
+
+
+def board_arrays(board, probabilities):
+    """
+    Builds the (height, width) arrays the scorer works on:
+    p_mine (0.5 where unknown), clue (hidden neighbor count of safe cells) and
+    candidates (unrevealed, unflagged cells).
+    clue and candidates are cached per board and must be treated as read-only.
+    """
+    shape = (board.height, board.width)
+    size = board.height * board.width
+    cached = _ARRAYS.get(board)
+    if cached is None:
+        cells = [c for row in board.grid for c in row]
+        clue = np.fromiter((0 if c.has_mine else c.neighbor_mines for c in cells),
+                           dtype=float, count=size).reshape(shape)
+        clue.flags.writeable = False
+        cached = _ARRAYS[board] = [None, clue, cells, None]
+    if cached[0] != board.zobrist_hash:
+        candidates = np.fromiter((not c.revealed and not c.flagged for c in cached[2]),
+                                 dtype=bool, count=size).reshape(shape)
+        candidates.flags.writeable = False
+        cached[0], cached[3] = board.zobrist_hash, candidates
+    p_mine = np.full(size, 0.5)
+    if probabilities:
+        n = len(probabilities)
+        cells = np.fromiter((y * board.width + x for x, y in probabilities), dtype=np.intp, count=n)
+        p_mine[cells] = np.fromiter(probabilities.values(), dtype=float, count=n)
+    return p_mine.reshape(shape), cached[1], cached[3]
+
+
+def score_actions(p_mine, clue, candidates, clue_bonus=False, chance_reveal=False,
+                  flag_reward=0.0, flag_threshold=None):
+    """
+    Closed-form one-ply values for every cell at once.
+    :return: (reveal_values, flag_values), arrays shaped like p_mine with -inf for non-candidates.
+    """
+    safe_gain = 1 + clue if clue_bonus else np.ones_like(p_mine)
+    reveal = (1 - p_mine) * safe_gain + p_mine * (-10)
+    if chance_reveal:
+        reveal = (1 - p_mine) * reveal + p_mine * (-10)
+    if flag_threshold is None:
+        flag = np.full_like(p_mine, flag_reward)
+    else:
+        flag = np.where(p_mine > flag_threshold, flag_reward, 0.0)
+    reveal = np.where(candidates, reveal, -np.inf)
+    flag = np.where(candidates, flag, -np.inf)
+    return reveal, flag
+
+
+def best_action(reveal, flag):
+    """
+    Argmax over all actions in MDP.available_actions order (cells row by row, reveal before
+    flag), so ties resolve exactly like the scalar search. None if there is no candidate.
+    """
+    values = np.stack([reveal.ravel(), flag.ravel()], axis=1).ravel()
+    i = int(np.argmax(values))
+    if not np.isfinite(values[i]):
+        return None
+    cell, kind = divmod(i, 2)
+    width = reveal.shape[1]
+    return ("reveal" if kind == 0 else "flag", cell % width, cell // width)
+
+
+class VectorizedGreedy:
+    """
+    Greedy one-ply policy with the MDP interface: scores every reveal and flag from the
+    probability and clue arrays in a few NumPy operations instead of one Python call per action.
+    Matches MDP(depth=1) of the chosen variant (for "sj", on the probabilities as given).
+    """
+    def __init__(self, board, probabilities, depth=1, variant="mdp"):
+        self.initial_board = board
+        self.probabilities = probabilities
+        self.depth = depth
+        self.options = VARIANTS[variant]
+
+    def find_best_action(self):
+        p_mine, clue, candidates = board_arrays(self.initial_board, self.probabilities)
+        reveal, flag = score_actions(p_mine, clue, candidates, **self.options)
+        return best_action(reveal, flag)
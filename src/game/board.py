@@ -1,19 +1,46 @@
 import random
 from .cell import Cell
+from .zobrist import zobrist_keys, compute_hash
+
+_NEIGHBORS = {}
+
+
+def neighbor_coordinates(width, height):
+    """
+    Returns, for every cell [y][x], the (x, y) of its neighbors in get_neighbors order.
+    Cached per board size, so boards do not redo the bounds checks on every call.
+    """
+    size = (width, height)
+    if size not in _NEIGHBORS:
+        _NEIGHBORS[size] = [[tuple((nx, ny)
+                                   for nx in (x - 1, x, x + 1)
+                                   for ny in (y - 1, y, y + 1)
+                                   if 0 <= nx < width and 0 <= ny < height and not (nx == x and ny == y))
+                             for x in range(width)]
+                            for y in range(height)]
+    return _NEIGHBORS[size]
+
 
 class Board:
-    def __init__(self, width=9, height=9, mines=10):
+    def __init__(self, width=9, height=9, mines=10, seed=None):
         self.width = width
         self.height = height
         self.mines = mines
+        self.seed = seed  # Mine layout seed; None uses the global random state
         self.grid = []
         self.game_over = False
+        self.zobrist_hash = 0  # Incremental hash of revealed/flagged state, see zobrist.py
+        # Incremental counters, so metrics do not have to scan the grid
+        self.revealed_count = 0
+        self.flagged_count = 0
+        self.revealed_mines = 0
         self._initialize_board()
 
     def _initialize_board(self):
         # Place mines
         cells = [Cell(x, y) for y in range(self.height) for x in range(self.width)]
-        mine_positions = random.sample(cells, self.mines)
+        rng = random.Random(self.seed) if self.seed is not None else random
+        mine_positions = rng.sample(cells, self.mines)
         for cell in mine_positions:
             cell.has_mine = True
 
@@ -31,13 +58,8 @@ class Board:
         return sum(1 for c in neighbors if c.has_mine)
 
     def get_neighbors(self, x, y):
-        neighbors = []
-        for nx in [x-1, x, x+1]:
-            for ny in [y-1, y, y+1]:
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    if not (nx == x and ny == y):
-                        neighbors.append(self.grid[ny][nx])
-        return neighbors
+        grid = self.grid
+        return [grid[ny][nx] for nx, ny in neighbor_coordinates(self.width, self.height)[y][x]]
 
     def reveal_cell(self, x, y):
         cell = self.grid[y][x]
@@ -45,7 +67,10 @@ class Board:
             return
 
         cell.revealed = True
+        self.zobrist_hash ^= zobrist_keys(self.width, self.height)[0][y * self.width + x]
+        self.revealed_count += 1
         if cell.has_mine:
+            self.revealed_mines += 1
             self.game_over = True
             return
 
@@ -59,6 +84,23 @@ class Board:
         cell = self.grid[y][x]
         if not cell.revealed:
             cell.flagged = not cell.flagged
+            self.zobrist_hash ^= zobrist_keys(self.width, self.height)[1][y * self.width + x]
+            self.flagged_count += 1 if cell.flagged else -1
+
+    def rehash(self):
+        # Recompute the Zobrist hash and the counters after cell states were changed directly
+        self.zobrist_hash = compute_hash(self)
+        cells = [c for row in self.grid for c in row]
+        self.revealed_count = sum(1 for c in cells if c.revealed)
+        self.flagged_count = sum(1 for c in cells if c.flagged)
+        self.revealed_mines = sum(1 for c in cells if c.revealed and c.has_mine)
+
+    def count_unrevealed(self):
+        # Same count as len(get_unrevealed_cells()), from the counters
+        return self.width * self.height - self.revealed_count - self.flagged_count
+
+    def count_revealed_safe(self):
+        return self.revealed_count - self.revealed_mines
 
     def is_victory(self):
         # Victory if all non-mine cells are revealed
@@ -1,20 +1,28 @@
 import random
 from .cell_sj import Cell
+from .zobrist import zobrist_keys, compute_hash
 
 class Board:
-    def __init__(self, width=9, height=9, mines=10):
+    def __init__(self, width=9, height=9, mines=10, seed=None):
         self.width = width
         self.height = height
         self.mines = mines
+        self.seed = seed  # Mine layout seed; None uses the global random state
         self.grid = []
         self.probabilities = [[0.5] * width for _ in range(height)]  # Initialize probabilities
         self.game_over = False
+        self.zobrist_hash = 0  # Incremental hash of revealed/flagged state, see zobrist.py
+        # Incremental counters, so metrics do not have to scan the grid
+        self.revealed_count = 0
+        self.flagged_count = 0
+        self.revealed_mines = 0
         self._initialize_board()
 
     def _initialize_board(self):
         # Place mines
         cells = [Cell(x, y) for y in range(self.height) for x in range(self.width)]
-        mine_positions = random.sample(cells, self.mines)
+        rng = random.Random(self.seed) if self.seed is not None else random
+        mine_positions = rng.sample(cells, self.mines)
         for cell in mine_positions:
             cell.has_mine = True
 
@@ -46,7 +54,10 @@ class Board:
             return
 
         cell.revealed = True
+        self.zobrist_hash ^= zobrist_keys(self.width, self.height)[0][y * self.width + x]
+        self.revealed_count += 1
         if cell.has_mine:
+            self.revealed_mines += 1
             self.game_over = True
             return
 
@@ -60,6 +71,23 @@ class Board:
         cell = self.grid[y][x]
         if not cell.revealed:
             cell.flagged = not cell.flagged
+            self.zobrist_hash ^= zobrist_keys(self.width, self.height)[1][y * self.width + x]
+            self.flagged_count += 1 if cell.flagged else -1
+
+    def rehash(self):
+        # Recompute the Zobrist hash and the counters after cell states were changed directly
+        self.zobrist_hash = compute_hash(self)
+        cells = [c for row in self.grid for c in row]
+        self.revealed_count = sum(1 for c in cells if c.revealed)
+        self.flagged_count = sum(1 for c in cells if c.flagged)
+        self.revealed_mines = sum(1 for c in cells if c.revealed and c.has_mine)
+
+    def count_unrevealed(self):
+        # Same count as len(get_unrevealed_cells()), from the counters
+        return self.width * self.height - self.revealed_count - self.flagged_count
+
+    def count_revealed_safe(self):
+        return self.revealed_count - self.revealed_mines
 
     def is_victory(self):
         # Victory if all non-mine cells are revealed
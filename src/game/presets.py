@@ -0,0 +1,6 @@
+# Standard difficulty presets: name -> (width, height, mines)
+PRESETS = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (30, 16, 99),
+}
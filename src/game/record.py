@@ -0,0 +1,268 @@
+"""
+Compact binary game records and a replay engine.
+
+A record stores what is needed to reproduce a game without the AI: the mine layout (the
+board seed, or a bitmap when the board was not seeded) and the moves, packed as unsigned
+LEB128 varints:
+    flags           bit 0: layout is a seed, bit 1: the game was won
+    width, height, mines
+    seed            if seeded, else ceil(width * height / 8) bitmap bytes,
+                    bit i (LSB first) set if cell i = y * width + x has a mine
+    move count
+    moves           (cell << 2) | (flag << 1) | last move of its step
+The step bit keeps the game loop's step boundaries (a step may apply a batch of certain
+moves or a macro), so metrics series can be regenerated step for step.
+A beginner game takes some 20-60 bytes.
+
+Record files (<store>/part-<pid>.rec, one per writing process like utils/columnar.py)
+are b"GRREC" + version, then varint-length-prefixed records.
+"""
+import glob
+import os
+from .board import Board
+
+MAGIC = b"GRREC"
+VERSION = 1
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class GameRecord:
+    """
+    One game: dimensions, mine layout (`seed`, or `bitmap` bytes if seed is None), outcome,
+    and `moves` as (cell index, is_flag) pairs with `step_ends`, the move count after each step.
+    """
+    __slots__ = ("width", "height", "mines", "seed", "bitmap", "won", "moves", "step_ends")
+
+    def __init__(self, width, height, mines, seed=None, bitmap=None, won=False, moves=(), step_ends=()):
+        self.width = width
+        self.height = height
+        self.mines = mines
+        self.seed = seed
+        self.bitmap = bitmap
+        self.won = won
+        self.moves = list(moves)
+        self.step_ends = list(step_ends)
+
+    @classmethod
+    def from_game(cls, board, moves, step_ends, won):
+        """Record of a played game; `moves` are (x, y, action) tuples as passed to make_move."""
+        seed = board.seed if isinstance(board.seed, int) and board.seed >= 0 else None
+        bitmap = None
+        if seed is None:
+            bits = bytearray((board.width * board.height + 7) // 8)
+            for row in board.grid:
+                for c in row:
+                    if c.has_mine:
+                        i = c.y * board.width + c.x
+                        bits[i >> 3] |= 1 << (i & 7)
+            bitmap = bytes(bits)
+        return cls(board.width, board.height, board.mines, seed, bitmap, won,
+                   [(y * board.width + x, action == "flag") for x, y, action in moves], step_ends)
+
+    def encode(self):
+        out = bytearray()
+        _write_varint(out, (self.seed is not None) | (bool(self.won) << 1))
+        _write_varint(out, self.width)
+        _write_varint(out, self.height)
+        _write_varint(out, self.mines)
+        if self.seed is not None:
+            _write_varint(out, self.seed)
+        else:
+            out += self.bitmap
+        _write_varint(out, len(self.moves))
+        ends = set(self.step_ends)
+        for i, (cell, flag) in enumerate(self.moves):
+            _write_varint(out, (cell << 2) | (flag << 1) | ((i + 1) in ends))
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data, pos=0):
+        flags, pos = _read_varint(data, pos)
+        width, pos = _read_varint(data, pos)
+        height, pos = _read_varint(data, pos)
+        mines, pos = _read_varint(data, pos)
+        seed = bitmap = None
+        if flags & 1:
+            seed, pos = _read_varint(data, pos)
+        else:
+            size = (width * height + 7) // 8
+            bitmap = bytes(data[pos:pos + size])
+            pos += size
+        count, pos = _read_varint(data, pos)
+        moves = []
+        step_ends = []
+        for i in range(count):
+            value, pos = _read_varint(data, pos)
+            moves.append((value >> 2, bool(value & 2)))
+            if value & 1:
+                step_ends.append(i + 1)
+        return cls(width, height, mines, seed, bitmap, bool(flags & 2), moves, step_ends)
+
+    def steps(self):
+        """The moves grouped by game-loop step: a list of lists of (x, y, action)."""
+        grouped = []
+        start = 0
+        for end in self.step_ends:
+            grouped.append([(cell % self.width, cell // self.width, "flag" if flag else "reveal")
+                            for cell, flag in self.moves[start:end]])
+            start = end
+        return grouped
+
+
+class GameRecorder:
+    """
+    Game manager proxy that records every move passed to make_move and, on end_step, the
+    step boundaries. Everything else is forwarded to the wrapped manager.
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self.recorded_moves = []
+        self.step_ends = []
+
+    def make_move(self, x, y, action="reveal"):
+        if not self.manager.board.game_over:
+            self.recorded_moves.append((x, y, action))
+        self.manager.make_move(x, y, action)
+
+    def end_step(self):
+        if self.recorded_moves and (not self.step_ends or self.step_ends[-1] != len(self.recorded_moves)):
+            self.step_ends.append(len(self.recorded_moves))
+
+    def record(self):
+        return GameRecord.from_game(self.manager.board, self.recorded_moves, self.step_ends,
+                                    self.manager.is_victory())
+
+    def __getattr__(self, name):
+        return getattr(self.manager, name)
+
+
+class RecordWriter:
+    """Appends encoded records to this process's part of a record store directory."""
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"part-{os.getpid()}.rec")
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, "ab")
+        if new:
+            self.file.write(MAGIC + bytes([VERSION]))
+
+    def write(self, record):
+        data = record.encode()
+        out = bytearray()
+        _write_varint(out, len(data))
+        self.file.write(out + data)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_records(path):
+    """Yields the GameRecords of a record file, or of every part of a record store directory."""
+    paths = sorted(glob.glob(os.path.join(path, "part-*.rec"))) if os.path.isdir(path) else [path]
+    for file in paths:
+        with open(file, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{file} is not a game record file")
+        if data[len(MAGIC)] != VERSION:
+            raise ValueError(f"{file}: unsupported version {data[len(MAGIC)]}")
+        pos = len(MAGIC) + 1
+        while pos < len(data):
+            size, pos = _read_varint(data, pos)
+            yield GameRecord.decode(data, pos)
+            pos += size
+
+
+def new_board(record, board_class=Board):
+    """The record's board before any move, with its original mine layout."""
+    if record.seed is not None:
+        return board_class(record.width, record.height, record.mines, seed=record.seed)
+    board = board_class(record.width, record.height, 0, seed=0)
+    board.mines = record.mines
+    board.seed = None
+    cells = [c for row in board.grid for c in row]
+    for i, c in enumerate(cells):
+        c.has_mine = bool(record.bitmap[i >> 3] >> (i & 7) & 1)
+    for c in cells:
+        c.neighbor_mines = 0 if c.has_mine else board.count_neighbor_mines(c.x, c.y)
+    return board
+
+
+def iter_replay(record, board_class=Board):
+    """
+    Replays the record on a fresh board, no AI involved, yielding (step, board) after each step's
+    moves. The same board object is mutated in place; moves after the game ended are ignored.
+    """
+    board = new_board(record, board_class)
+    for step, moves in enumerate(record.steps()):
+        for x, y, action in moves:
+            if board.game_over:
+                break
+            if action == "flag":
+                board.flag_cell(x, y)
+            else:
+                board.reveal_cell(x, y)
+        yield step, board
+
+
+def replay(record, board_class=Board, steps=None):
+    """The board after the first `steps` steps of the record (all of them by default)."""
+    if steps is not None and steps <= 0:
+        return new_board(record, board_class)
+    board = None
+    for step, board in iter_replay(record, board_class):
+        if steps is not None and step + 1 >= steps:
+            return board
+    return board if board is not None else new_board(record, board_class)
+
+
+def replay_metrics(record, analyzer, metrics, board_class=Board, clue_bias=False):
+    """
+    Regenerates a game's metrics series: like the game loop, the probabilities are computed
+    before each step's moves and `metrics` (a DynamicGR) is updated after them. Only the
+    analyzer runs, no planner. `clue_bias` applies the withclues variant's probability
+    adjustment. Returns metrics.history. The series matches the recorded one as long as the
+    planner leaves the probability map alone; mdp_sj rewrites it in place on planner steps,
+    so for sj games only the count-based fields (complexity, goal progress, acceleration,
+    jerk) are reproduced exactly.
+    """
+    board = new_board(record, board_class)
+    for step, moves in enumerate(record.steps()):
+        probabilities = analyzer.compute_probabilities(board)
+        if clue_bias:
+            for cell in board.get_unrevealed_cells():
+                if cell.neighbor_mines > 0:
+                    probabilities[(cell.x, cell.y)] *= (1 + 0.1 * cell.neighbor_mines)
+        for x, y, action in moves:
+            if board.game_over:
+                break
+            if action == "flag":
+                board.flag_cell(x, y)
+            else:
+                board.reveal_cell(x, y)
+        metrics.update(board, step, probabilities)
+    return metrics.history
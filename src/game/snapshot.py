@@ -0,0 +1,44 @@
+"""
+Compact, picklable board snapshots.
+
+A snapshot is a small tuple with one byte per cell instead of the full `Cell` object graph,
+so it is cheap to ship to worker processes:
+    (board_class, cell_class, width, height, mines, game_over, cell_bytes)
+with each byte laid out as  has_mine | revealed << 1 | flagged << 2 | neighbor_mines << 3.
+"""
+
+
+def snapshot_board(board):
+    cells = bytearray(board.width * board.height)
+    for y in range(board.height):
+        for x in range(board.width):
+            c = board.grid[y][x]
+            cells[y * board.width + x] = (c.has_mine | (c.revealed << 1) | (c.flagged << 2)
+                                          | (c.neighbor_mines << 3))
+    cell_class = type(board.grid[0][0]) if board.grid else None
+    return (type(board), cell_class, board.width, board.height, board.mines, board.game_over, bytes(cells))
+
+
+def restore_board(snapshot):
+    """Rebuilds a board of the original class from a snapshot, without placing new mines."""
+    board_class, cell_class, width, height, mines, game_over, cells = snapshot
+    board = board_class.__new__(board_class)
+    board.width = width
+    board.height = height
+    board.mines = mines
+    board.seed = None  # The layout comes from the snapshot, not a seed
+    board.game_over = game_over
+    board.grid = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            packed = cells[y * width + x]
+            c = cell_class(x, y)
+            c.has_mine = bool(packed & 1)
+            c.revealed = bool(packed & 2)
+            c.flagged = bool(packed & 4)
+            c.neighbor_mines = packed >> 3
+            row.append(c)
+        board.grid.append(row)
+    board.rehash()
+    return board
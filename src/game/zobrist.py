@@ -0,0 +1,49 @@
+import random
+
+_KEYS = {}
+
+# Mixed into the hash of boards whose game is over (a mine was revealed)
+GAME_OVER_KEY = random.Random("game_over").getrandbits(64)
+
+
+def zobrist_keys(width, height):
+    """
+    Returns the per-cell (revealed_keys, flagged_keys) lists for a board size.
+    Keys come from a private, size-seeded generator so they are identical across
+    runs and processes and never consume the global `random` state used for mine placement.
+    """
+    size = (width, height)
+    if size not in _KEYS:
+        rng = random.Random(f"zobrist-{width}x{height}")
+        cells = width * height
+        revealed_keys = [rng.getrandbits(64) for _ in range(cells)]
+        flagged_keys = [rng.getrandbits(64) for _ in range(cells)]
+        _KEYS[size] = (revealed_keys, flagged_keys)
+    return _KEYS[size]
+
+
+def compute_hash(board):
+    """Computes the Zobrist hash of a board's revealed/flagged state from scratch."""
+    revealed_keys, flagged_keys = zobrist_keys(board.width, board.height)
+    h = 0
+    for y in range(board.height):
+        for x in range(board.width):
+            c = board.grid[y][x]
+            i = y * board.width + x
+            if c.revealed:
+                h ^= revealed_keys[i]
+            if c.flagged:
+                h ^= flagged_keys[i]
+    return h
+
+
+def state_key(board):
+    """
+    Hash of the board's visible state, distinguishing finished games. Boards built on a sampled
+    hidden layout (see ai/chance.py) mix in their `layout_salt`: they look like the real board
+    but hide other clues, so their search values must not share transposition entries.
+    """
+    key = board.zobrist_hash ^ getattr(board, "layout_salt", 0)
+    if board.game_over:
+        return key ^ GAME_OVER_KEY
+    return key
@@ -0,0 +1,175 @@
+import bisect
+import csv
+import math
+
+FIELDS = ("gr", "complexity", "goal_progress", "entropy", "acceleration", "jerk")
+
+
+class QuantileSketch:
+    """
+    Mergeable t-digest-style quantile sketch: a sorted list of (mean, weight) centroids.
+    Neighbors are merged while the centroid spans at most one unit of the k1 scale function,
+    which keeps at most about `compression` centroids and makes them small at the tails,
+    so extreme quantiles stay accurate.
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.centroids = []  # [mean, weight], sorted by mean
+        self.buffer = []
+        self.count = 0
+
+    def add(self, value, weight=1):
+        self.buffer.append([value, weight])
+        self.count += weight
+        if len(self.buffer) >= self.compression:
+            self._compress()
+
+    def merge(self, other):
+        self.buffer.extend([c[0], c[1]] for c in other.centroids + other.buffer)
+        self.count += other.count
+        self._compress()
+
+    def _scale(self, q):
+        # t-digest k1 scale function: one unit of k per centroid, finer towards q = 0 and 1
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self):
+        points = sorted(self.centroids + self.buffer)
+        self.buffer = []
+        if not points:
+            return
+        total = sum(w for _, w in points)
+        merged = [list(points[0])]
+        seen = 0.0
+        k_lower = self._scale(0.0)
+        for value, weight in points[1:]:
+            last = merged[-1]
+            if self._scale((seen + last[1] + weight) / total) - k_lower <= 1:
+                last[0] = (last[0] * last[1] + value * weight) / (last[1] + weight)
+                last[1] += weight
+            else:
+                seen += last[1]
+                k_lower = self._scale(seen / total)
+                merged.append([value, weight])
+        self.centroids = merged
+
+    def quantile(self, q):
+        if self.buffer:
+            self._compress()
+        if not self.centroids:
+            return float("nan")
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        # Interpolate between centroid centers placed at their cumulative mid-weights
+        target = q * self.count
+        centers = []
+        seen = 0.0
+        for mean, weight in self.centroids:
+            centers.append(seen + weight / 2)
+            seen += weight
+        i = bisect.bisect_left(centers, target)
+        if i == 0:
+            return self.centroids[0][0]
+        if i == len(centers):
+            return self.centroids[-1][0]
+        lo, hi = centers[i - 1], centers[i]
+        t = (target - lo) / (hi - lo)
+        return self.centroids[i - 1][0] + t * (self.centroids[i][0] - self.centroids[i - 1][0])
+
+
+class RunningStats:
+    """Count, mean and variance (Welford), min/max and a quantile sketch of one field."""
+    def __init__(self, compression=100):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(compression)
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        # Chan et al. pairwise combination of the Welford moments
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+
+class GRAggregator:
+    """
+    Streaming campaign statistics of DynamicGR data points in one bucket per (outcome, step):
+    RunningStats for every field in FIELDS. Memory is constant per bucket, whatever the
+    number of games; aggregators built in different processes combine with `merge`.
+    """
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.buckets = {}  # ("win" | "loss", step) -> {field: RunningStats}
+        self.games = {"win": 0, "loss": 0}
+
+    def add_game(self, history, won):
+        """Adds a finished game: `history` is DynamicGR.history (a list of data point dicts)."""
+        outcome = "win" if won else "loss"
+        self.games[outcome] += 1
+        for point in history:
+            bucket = self.buckets.get((outcome, point['step']))
+            if bucket is None:
+                bucket = self.buckets[(outcome, point['step'])] = {
+                    field: RunningStats(self.compression) for field in FIELDS}
+            for field in FIELDS:
+                bucket[field].add(float(point[field]))
+
+    def merge(self, other):
+        for outcome, games in other.games.items():
+            self.games[outcome] += games
+        for key, other_bucket in other.buckets.items():
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = {field: RunningStats(self.compression) for field in FIELDS}
+            for field in FIELDS:
+                bucket[field].merge(other_bucket[field])
+
+    def stats(self, step, field, outcome=None):
+        """RunningStats of `field` at `step`, for one outcome or (None) both combined."""
+        outcomes = (outcome,) if outcome is not None else ("win", "loss")
+        combined = RunningStats(self.compression)
+        for o in outcomes:
+            bucket = self.buckets.get((o, step))
+            if bucket is not None:
+                combined.merge(bucket[field])
+        return combined
+
+    def rows(self, quantiles=(0.1, 0.5, 0.9)):
+        """One summary row per (outcome, step, field), sorted by outcome and step."""
+        for (outcome, step), bucket in sorted(self.buckets.items()):
+            for field in FIELDS:
+                s = bucket[field]
+                yield ([outcome, step, field, s.count, s.mean, s.std(), s.min, s.max]
+                       + [s.sketch.quantile(q) for q in quantiles])
+
+    def to_csv(self, path, quantiles=(0.1, 0.5, 0.9)):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Outcome", "Step", "Field", "Count", "Mean", "Std", "Min", "Max"]
+                            + [f"P{round(q * 100)}" for q in quantiles])
+            writer.writerows(self.rows(quantiles))
@@ -1,26 +1,44 @@
 import math
+from src.metrics.entropy import EntropyTracker, board_entropy
 
 class DynamicGR:
-    def __init__(self):
+    """
+    `mode` picks how the board statistics are gathered each step:
+    - "exact": scan the grid and loop over the unknown cells (the reference implementation),
+    - "vectorized": board counters + one NumPy pass over the probabilities,
+    - "incremental": board counters + entropy updated only for cells whose probability changed.
+    """
+    def __init__(self, mode="vectorized"):
         self.history = []
         self.reveals_history = []
+        self.mode = mode
+        self.entropy_tracker = EntropyTracker() if mode == "incremental" else None
 
     def update(self, board, step, probabilities):
-        unrevealed = board.get_unrevealed_cells()
         total_cells = board.width * board.height
-        complexity = len(unrevealed) / total_cells if total_cells > 0 else 0.0
-
         safe_cells = total_cells - board.mines
-        revealed_safe = sum(1 for row in board.grid for c in row if c.revealed and not c.has_mine)
-        goal_progress = revealed_safe / safe_cells if safe_cells > 0 else 0
+        if self.mode == "exact":
+            unrevealed = board.get_unrevealed_cells()
+            unknown = len(unrevealed)
+            revealed_safe = sum(1 for row in board.grid for c in row if c.revealed and not c.has_mine)
 
-        # Compute entropy from probabilities: For each unrevealed cell, p = probability of mine
-        # Entropy for that cell: H_cell = -(p*log2(p) + (1-p)*log2(1-p)) if p not in {0,1}
-        entropy = 0.0
-        for c in unrevealed:
-            p = probabilities.get((c.x, c.y), 0.5)
-            if p > 0 and p < 1:
-                entropy += -(p*math.log2(p) + (1-p)*math.log2(1-p))
+            # Compute entropy from probabilities: For each unrevealed cell, p = probability of mine
+            # Entropy for that cell: H_cell = -(p*log2(p) + (1-p)*log2(1-p)) if p not in {0,1}
+            entropy = 0.0
+            for c in unrevealed:
+                p = probabilities.get((c.x, c.y), 0.5)
+                if p > 0 and p < 1:
+                    entropy += -(p*math.log2(p) + (1-p)*math.log2(1-p))
+        else:
+            unknown = board.count_unrevealed()
+            revealed_safe = board.count_revealed_safe()
+            if self.entropy_tracker is not None:
+                entropy = self.entropy_tracker.update(board, probabilities)
+            else:
+                entropy = board_entropy(board, probabilities)
+
+        complexity = unknown / total_cells if total_cells > 0 else 0.0
+        goal_progress = revealed_safe / safe_cells if safe_cells > 0 else 0
 
         # Psychological metrics: acceleration & jerk
         self.reveals_history.append(revealed_safe)
@@ -1,25 +1,54 @@
 import math
-import csv
-import matplotlib.pyplot as plt
+from src.metrics.entropy import EntropyTracker, board_entropy
+from src.utils.logger import BufferedCSVLogger
+
+# Default GR weights; src/metrics/recompute.py sweeps them offline over recorded games
+ENTROPY_WEIGHT = 0.1
+ACC_WEIGHT = 0.01
+JERK_WEIGHT = 0.001
 
 class DynamicGR:
-    def __init__(self, log_file=None):
+    def __init__(self, log_file=None, mode="vectorized", entropy_weight=ENTROPY_WEIGHT, acc_weight=ACC_WEIGHT,
+                 jerk_weight=JERK_WEIGHT):
+        # mode: "exact" (grid scan + per-cell loop), "vectorized" (board counters + one NumPy pass)
+        # or "incremental" (board counters + entropy recomputed only for changed cells)
         self.history = []
         self.reveals_history = []
-        self.logger = CSVLogger(log_file) if log_file else None
+        self.logger = BufferedCSVLogger(log_file) if log_file else None
+        self.mode = mode
+        self.entropy_tracker = EntropyTracker() if mode == "incremental" else None
+        self.entropy_weight = entropy_weight
+        self.acc_weight = acc_weight
+        self.jerk_weight = jerk_weight
 
     def update(self, board, step, probabilities):
-        unrevealed = board.get_unrevealed_cells()
         total_cells = board.width * board.height
+        if self.mode == "exact":
+            unrevealed = board.get_unrevealed_cells()
+            unknown = len(unrevealed)
+            revealed_safe = sum(1 for row in board.grid for c in row if c.revealed and not c.has_mine)
+
+            # Compute entropy from probabilities: For each unrevealed cell, p = probability of mine
+            entropy = 0.0
+            for c in unrevealed:
+                p = probabilities.get((c.x, c.y), 0.5)
+                if 0 < p < 1:  # Avoid log2 errors for p=0 or p=1
+                    entropy += -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+        else:
+            unknown = board.count_unrevealed()
+            revealed_safe = board.count_revealed_safe()
+            if self.entropy_tracker is not None:
+                entropy = self.entropy_tracker.update(board, probabilities)
+            else:
+                entropy = board_entropy(board, probabilities)
 
         # Handle edge case: Empty board
         if total_cells == 0:
             complexity = 0.0
         else:
-            complexity = len(unrevealed) / total_cells
+            complexity = unknown / total_cells
 
         safe_cells = total_cells - board.mines
-        revealed_safe = sum(1 for row in board.grid for c in row if c.revealed and not c.has_mine)
 
         # Handle edge case: No safe cells
         if safe_cells == 0:
@@ -27,13 +56,6 @@ class DynamicGR:
         else:
             goal_progress = revealed_safe / safe_cells
 
-        # Compute entropy from probabilities: For each unrevealed cell, p = probability of mine
-        entropy = 0.0
-        for c in unrevealed:
-            p = probabilities.get((c.x, c.y), 0.5)
-            if 0 < p < 1:  # Avoid log2 errors for p=0 or p=1
-                entropy += -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
-
         # Psychological metrics: acceleration & jerk
         self.reveals_history.append(revealed_safe)
         acc, jerk = self._compute_psychological_metrics()
@@ -42,12 +64,12 @@ class DynamicGR:
         base_gr = math.sqrt(goal_progress * (1 - complexity + 1e-9))  # Add small epsilon to avoid division issues
 
         # Add entropy factor to indicate uncertainty
-        entropy_weight = 0.1  # Adjustable parameter for tuning entropy impact
+        entropy_weight = self.entropy_weight  # Adjustable parameter for tuning entropy impact
         dynamic_factor = 1 + (entropy * entropy_weight)
 
         # Add motion factor based on acceleration and jerk
-        acc_weight = 0.01  # Adjustable parameter for tuning acceleration impact
-        jerk_weight = 0.001  # Adjustable parameter for tuning jerk impact
+        acc_weight = self.acc_weight  # Adjustable parameter for tuning acceleration impact
+        jerk_weight = self.jerk_weight  # Adjustable parameter for tuning jerk impact
         motion_factor = (1 + abs(acc) * acc_weight + abs(jerk) * jerk_weight)
 
         # Normalize GR value
@@ -80,35 +102,34 @@ class DynamicGR:
         jerk = acc - prev_acc
         return acc, jerk
 
-    def visualize_gr_history(self):
-        # Optional: Provide a simple way to visualize GR trends
+    def visualize_gr_history(self, path="gr_history.png"):
+        # Optional: Provide a simple way to visualize GR trends.
+        # The plot is saved to `path` by the headless backend, never shown in a window;
+        # batch runs render their plots after the games with src/metrics/report.py.
         try:
-            
+            from src.metrics.report import pyplot
+            plt = pyplot()
+
             steps = [data['step'] for data in self.history]
             gr_values = [data['gr'] for data in self.history]
 
+            plt.figure()
             plt.plot(steps, gr_values, marker='o', label='GR Value')
             plt.xlabel('Step')
             plt.ylabel('GR Value')
             plt.title('GR Value Over Time')
             plt.legend()
-            plt.show()
+            plt.savefig(path)
+            plt.close()
+            return path
         except ImportError:
             print("Visualization requires matplotlib. Install it to use this feature.")
 
+    def close(self):
+        # Writes the rows still buffered by the logger
+        if self.logger:
+            self.logger.close()
+
     def get_history(self):
         # Retrieve the history of GR calculations
         return self.history
-
-class CSVLogger:
-    def __init__(self, filename):
-        self.filename = filename
-        with open(self.filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Step", "GR", "Complexity", "Goal_Progress", "Entropy", "Acceleration", "Jerk"])
-
-    def log(self, step, gr_data):
-        with open(self.filename, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([step, gr_data['gr'], gr_data['complexity'], gr_data['goal_progress'],
-                             gr_data['entropy'], gr_data['acceleration'], gr_data['jerk']])
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+def binary_entropy(p):
+    """Elementwise H(p) = -(p log2 p + (1 - p) log2 (1 - p)) in bits, 0 where p is 0 or 1 (or outside)."""
+    p = np.asarray(p, dtype=float)
+    inside = (p > 0) & (p < 1)
+    q = np.where(inside, p, 0.5)
+    return np.where(inside, -(q * np.log2(q) + (1 - q) * np.log2(1 - q)), 0.0)
+
+
+def _unknown_items(board, probabilities):
+    # The map is computed before the step's moves: drop the cells revealed or flagged since
+    grid = board.grid
+    return [(xy, p) for xy, p in probabilities.items()
+            if not (grid[xy[1]][xy[0]].revealed or grid[xy[1]][xy[0]].flagged)]
+
+
+def board_entropy(board, probabilities):
+    """
+    Total entropy of the unknown cells in one vectorized pass over the probability values.
+    Entries of `probabilities` for cells that are no longer unknown are ignored; unknown
+    cells missing from it count as p = 0.5, i.e. one bit each.
+    """
+    items = _unknown_items(board, probabilities)
+    values = np.fromiter((p for _, p in items), dtype=float, count=len(items))
+    missing = max(board.count_unrevealed() - len(items), 0)
+    return float(binary_entropy(values).sum()) + missing
+
+
+class EntropyTracker:
+    """
+    Incremental board entropy: keeps the per-cell probabilities and entropies of the previous
+    step as flat arrays and only recomputes H(p) for the cells whose probability changed
+    (cells that left the map, i.e. were revealed or flagged, drop to zero).
+    Same assumptions about `probabilities` as board_entropy.
+    """
+    def __init__(self):
+        self.p = None
+        self.h = None
+        self.total = 0.0
+
+    def update(self, board, probabilities):
+        size = board.width * board.height
+        if self.p is None or len(self.p) != size:
+            self.p = np.full(size, np.nan)
+            self.h = np.zeros(size)
+            self.total = 0.0
+
+        items = _unknown_items(board, probabilities)
+        p = np.full(size, np.nan)
+        if items:
+            index = np.fromiter((y * board.width + x for (x, y), _ in items), dtype=np.intp, count=len(items))
+            p[index] = np.fromiter((p for _, p in items), dtype=float, count=len(items))
+
+        changed = np.flatnonzero((p != self.p) & ~(np.isnan(p) & np.isnan(self.p)))
+        if len(changed):
+            h = binary_entropy(p[changed])  # NaN (no longer in the map) -> 0
+            self.total += float(h.sum() - self.h[changed].sum())
+            self.h[changed] = h
+            self.p[changed] = p[changed]
+
+        missing = max(board.count_unrevealed() - len(items), 0)
+        return self.total + missing
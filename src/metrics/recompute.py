@@ -0,0 +1,193 @@
+"""
+Offline recomputation of the GR series from recorded games, for many weight settings at once.
+
+Everything GR depends on except its weights is already recorded per step by the metrics
+loggers: complexity and goal progress (the unknown / revealed-safe counts over the board
+size), entropy (the probability field's contribution) and acceleration / jerk (the reveal
+deltas). So a campaign's metrics store (simulate.py --format columnar) or its per-game CSV
+files are the traces; re-tuning the weights needs no new simulation:
+
+    python -m src.metrics.recompute runs/big/metrics --results runs/big/game_results.csv \\
+        --entropy-weight 0 0.05 0.1 0.2 --acc-weight 0 0.01 0.02 --jerk-weight 0 0.001 --output sweep.csv
+
+GR is recomputed unnormalized, like dynamic_gr.py (the classic and withclues variants);
+add --normalize for traces of the sj variant, whose dynamic_gr_sj.py divides GR by
+1 + the weight sum.
+
+The GR formula is evaluated as one NumPy expression over (weight setting, row) blocks of
+whole games, then reduced per game (mean, final and peak GR).
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import numpy as np
+from src.metrics.dynamic_gr_sj import ACC_WEIGHT, ENTROPY_WEIGHT, JERK_WEIGHT
+from src.utils.columnar import load_store
+
+TRACE_FIELDS = ("complexity", "goal_progress", "entropy", "acceleration", "jerk")
+
+
+def is_store(path):
+    """True if `path` is a columnar metrics store (a directory of part-* subdirectories)."""
+    return os.path.isdir(path) and bool(glob.glob(os.path.join(path, "part-*")))
+
+
+def load_traces(path):
+    """
+    Per-step traces as {"game", "step", "gr", *TRACE_FIELDS: array}, sorted by game and step
+    ("gr" is the value recorded with the run's own weights).
+    `path` is a columnar store (game ids are the board seeds), a directory of
+    game_<n>_metrics.csv files (game ids are n) or a single metrics CSV (game 0).
+    """
+    if is_store(path):
+        store = load_store(path)
+        columns = {"game": np.asarray(store["game"]), "step": np.asarray(store["step"]),
+                   "gr": np.asarray(store["gr"], dtype=float)}
+        columns.update((field, np.asarray(store[field], dtype=float)) for field in TRACE_FIELDS)
+    else:
+        files = sorted(glob.glob(os.path.join(path, "game_*_metrics.csv"))) if os.path.isdir(path) else [path]
+        if not files:
+            raise ValueError(f"{path}: no columnar store or metrics CSV files")
+        parts = []
+        for file in files:
+            match = re.search(r"game_(\d+)_metrics\.csv$", file)
+            # Step, GR, Complexity, Goal_Progress, Entropy, Acceleration, Jerk
+            rows = np.loadtxt(file, delimiter=",", skiprows=1, ndmin=2)
+            parts.append((int(match.group(1)) if match else 0, rows))
+        rows = np.concatenate([rows for _, rows in parts]) if parts else np.empty((0, 7))
+        columns = {"game": np.concatenate([np.full(len(r), game, dtype=np.int64) for game, r in parts]),
+                   "step": rows[:, 0].astype(np.int32), "gr": rows[:, 1]}
+        columns.update((field, rows[:, i + 2]) for i, field in enumerate(TRACE_FIELDS))
+
+    order = np.lexsort((columns["step"], columns["game"]))
+    return {name: column[order] for name, column in columns.items()}
+
+
+def load_outcomes(path, key="Seed"):
+    """{game id: won} from a game_results.csv; key="Seed" for columnar stores, "Game" for CSV traces."""
+    with open(path, newline="") as f:
+        return {int(row[key]): row["Result"] == "Win" for row in csv.DictReader(f)}
+
+
+def weight_grid(entropy_weight=(ENTROPY_WEIGHT,), acc_weight=(ACC_WEIGHT,), jerk_weight=(JERK_WEIGHT,)):
+    """Cartesian product of the weight values as {"entropy_weight", "acc_weight", "jerk_weight": (G,) array}."""
+    axes = np.meshgrid(np.asarray(entropy_weight, dtype=float), np.asarray(acc_weight, dtype=float),
+                       np.asarray(jerk_weight, dtype=float), indexing="ij")
+    return {name: axis.ravel() for name, axis in zip(("entropy_weight", "acc_weight", "jerk_weight"), axes)}
+
+
+def gr_block(traces, grid, rows=slice(None), normalize=False):
+    """
+    GR of the trace rows `rows` under every weight setting: a (G, R) array. Same formula as
+    dynamic_gr.py's DynamicGR.update; normalize=True gives the normalized one of dynamic_gr_sj.py.
+    """
+    ew = grid["entropy_weight"][:, None]
+    aw = grid["acc_weight"][:, None]
+    jw = grid["jerk_weight"][:, None]
+    complexity = traces["complexity"][rows]
+    base = np.sqrt(traces["goal_progress"][rows] * (1 - complexity + 1e-9))
+    gr = base * (1 + traces["entropy"][rows] * ew)
+    gr *= 1 + np.abs(traces["acceleration"][rows]) * aw + np.abs(traces["jerk"][rows]) * jw
+    if normalize:
+        gr /= 1 + ew + aw + jw
+    return gr
+
+
+def sweep(traces, grid, normalize=False, block_size=1 << 22):
+    """
+    Per-game GR summaries for every weight setting: {"games": (N,) ids, "mean", "final",
+    "peak": (G, N) arrays}. Rows are processed in blocks of whole games holding about
+    `block_size` (setting, row) values, so memory stays bounded for any corpus size.
+    """
+    game = traces["game"]
+    size = len(game)
+    settings = len(grid["entropy_weight"])
+    starts = np.flatnonzero(np.r_[True, game[1:] != game[:-1]]) if size else np.empty(0, dtype=np.intp)
+    ends = np.r_[starts[1:], size].astype(np.intp)
+    result = {"games": game[starts], "mean": np.empty((settings, len(starts))),
+              "final": np.empty((settings, len(starts))), "peak": np.empty((settings, len(starts)))}
+
+    rows_per_block = max(block_size // max(settings, 1), 1)
+    first = 0
+    while first < len(starts):
+        last = max(int(np.searchsorted(ends, starts[first] + rows_per_block, side="right")), first + 1)
+        lo, hi = starts[first], ends[last - 1]
+        gr = gr_block(traces, grid, slice(lo, hi), normalize)
+        local = starts[first:last] - lo
+        result["mean"][:, first:last] = np.add.reduceat(gr, local, axis=1) / (ends[first:last] - starts[first:last])
+        result["final"][:, first:last] = gr[:, ends[first:last] - 1 - lo]
+        result["peak"][:, first:last] = np.maximum.reduceat(gr, local, axis=1)
+        first = last
+    return result
+
+
+def _auc(scores, won):
+    # Mann-Whitney AUC of every row of `scores` (G, N) as a predictor of `won` (N,), ties unbroken
+    wins, losses = int(won.sum()), int((~won).sum())
+    if wins == 0 or losses == 0:
+        return np.full(len(scores), np.nan)
+    ranks = np.argsort(np.argsort(scores, axis=1), axis=1) + 1
+    return (ranks[:, won].sum(axis=1) - wins * (wins + 1) / 2) / (wins * losses)
+
+
+def summarize(grid, result, outcomes=None):
+    """
+    One row per weight setting: the weights, mean of the per-game mean / final / peak GR and,
+    with `outcomes` ({game id: won}), the win and loss means of the per-game mean GR and the
+    AUC of the per-game mean GR as a win predictor.
+    """
+    header = ["entropy_weight", "acc_weight", "jerk_weight", "mean_gr", "final_gr", "peak_gr"]
+    columns = [grid["entropy_weight"], grid["acc_weight"], grid["jerk_weight"],
+               result["mean"].mean(axis=1), result["final"].mean(axis=1), result["peak"].mean(axis=1)]
+    if outcomes is not None:
+        known = np.array([game in outcomes for game in result["games"].tolist()], dtype=bool)
+        won = np.array([outcomes[game] for game in result["games"][known].tolist()], dtype=bool)
+        mean = result["mean"][:, known]
+        header += ["win_mean_gr", "loss_mean_gr", "auc"]
+        columns += [mean[:, won].mean(axis=1) if won.any() else np.full(len(mean), np.nan),
+                    mean[:, ~won].mean(axis=1) if (~won).any() else np.full(len(mean), np.nan),
+                    _auc(mean, won)]
+    return header, [list(row) for row in zip(*(column.tolist() for column in columns))]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute GR over recorded games for a grid of weights.")
+    parser.add_argument("traces", help="columnar metrics store, directory of game_<n>_metrics.csv, or one CSV")
+    parser.add_argument("--results", help="game_results.csv, to compare wins and losses")
+    parser.add_argument("--entropy-weight", type=float, nargs="+", default=[ENTROPY_WEIGHT])
+    parser.add_argument("--acc-weight", type=float, nargs="+", default=[ACC_WEIGHT])
+    parser.add_argument("--jerk-weight", type=float, nargs="+", default=[JERK_WEIGHT])
+    parser.add_argument("--normalize", action="store_true",
+                        help="normalized GR, as computed by dynamic_gr_sj.py (sj variant traces)")
+    parser.add_argument("--output", default="gr_sweep.csv", help="summary CSV (default: gr_sweep.csv)")
+    parser.add_argument("--top", type=int, default=10, help="settings to print, best AUC first (default: 10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    traces = load_traces(args.traces)
+    grid = weight_grid(args.entropy_weight, args.acc_weight, args.jerk_weight)
+    result = sweep(traces, grid, normalize=args.normalize)
+    outcomes = None
+    if args.results:
+        outcomes = load_outcomes(args.results, key="Seed" if is_store(args.traces) else "Game")
+    header, rows = summarize(grid, result, outcomes)
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+    print(f"{len(traces['game'])} steps of {len(result['games'])} games, {len(rows)} weight settings")
+    if outcomes is not None:
+        rows = sorted(rows, key=lambda row: -row[-1] if row[-1] == row[-1] else 0)
+    print("".join(f"{name:>15}" for name in header))
+    for row in rows[:args.top]:
+        print("".join(f"{value:>15.6g}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Post-simulation plot rendering.
+
+Plots are rendered to image files from the recorded metrics (a campaign's per-game CSV files
+or columnar store, see recompute.load_traces) once the games are over, in a pool of worker
+processes, so the game loop never waits on matplotlib and batch runs never block on a window.
+matplotlib is imported only by the rendering functions, with the non-interactive Agg backend.
+
+    python -m src.metrics.report runs/r1 --results runs/r1/game_results.csv
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.metrics.recompute import is_store, load_outcomes, load_traces
+
+PLOT_FIELDS = ("gr", "complexity", "goal_progress", "entropy")
+
+
+def pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on first use."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_game(steps, columns, path, title="GR Value Over Time"):
+    """One game's GR series and its components (arrays in `columns`) against `steps`, saved to `path`."""
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
+    axes[0].plot(steps, columns["gr"], marker="o", label="GR Value")
+    axes[0].set_ylabel("GR Value")
+    axes[0].set_title(title)
+    axes[0].legend()
+    for field in PLOT_FIELDS[1:]:
+        values = columns[field]
+        # Entropy is in bits, the other components are fractions: scale it to the same range
+        if field == "entropy" and len(values) and values.max() > 0:
+            values = values / values.max()
+            field = "entropy (scaled)"
+        axes[1].plot(steps, values, label=field)
+    axes[1].set_xlabel("Step")
+    axes[1].legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def plot_campaign(traces, path, outcomes=None, quantiles=(0.1, 0.9)):
+    """
+    Campaign overview saved to `path`: mean GR per step with a quantile band and a histogram of
+    game lengths, split into wins and losses when `outcomes` ({game id: won}) is given.
+    """
+    plt = pyplot()
+    game, step, gr = traces["game"], traces["step"], traces["gr"]
+    starts = np.flatnonzero(np.r_[True, game[1:] != game[:-1]]) if len(game) else np.empty(0, dtype=np.intp)
+    lengths = np.diff(np.r_[starts, len(game)])
+    if outcomes is None:
+        groups = {"all games": np.ones(len(game), dtype=bool)}
+        game_groups = {"all games": np.ones(len(starts), dtype=bool)}
+    else:
+        won = np.array([outcomes.get(g, False) for g in game[starts].tolist()], dtype=bool)
+        row_won = np.repeat(won, lengths)
+        groups = {"wins": row_won, "losses": ~row_won}
+        game_groups = {"wins": won, "losses": ~won}
+
+    fig, axes = plt.subplots(1, 2, figsize=(12, 4.5))
+    for label, rows in groups.items():
+        if not rows.any():
+            continue
+        steps = np.unique(step[rows])
+        values = [gr[rows & (step == s)] for s in steps]
+        axes[0].plot(steps, [v.mean() for v in values], label=f"{label} ({int(game_groups[label].sum())})")
+        axes[0].fill_between(steps, [np.quantile(v, quantiles[0]) for v in values],
+                             [np.quantile(v, quantiles[1]) for v in values], alpha=0.2)
+    axes[0].set_xlabel("Step")
+    axes[0].set_ylabel("GR Value")
+    axes[0].set_title(f"Mean GR per step (P{round(quantiles[0] * 100)}-P{round(quantiles[1] * 100)} band)")
+    axes[0].legend()
+    axes[1].hist([lengths[g] for g in game_groups.values()], bins=20, label=list(game_groups), stacked=True)
+    axes[1].set_xlabel("Steps per game")
+    axes[1].set_ylabel("Games")
+    axes[1].set_title("Game length")
+    axes[1].legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def render_reports(traces_path, output_dir=None, outcomes=None, max_games=50, workers=None, fmt="png"):
+    """
+    Renders the campaign plot and the per-game plots of the first `max_games` games (None: all)
+    recorded at `traces_path` into `output_dir` (default: next to the traces), using a pool of
+    `workers` processes. With `outcomes` ({game id: won}) only those games are plotted (e.g. the
+    games of this run, when older metrics files share the directory). Returns the written paths.
+    """
+    traces = load_traces(traces_path)
+    if outcomes is not None:
+        keep = np.isin(traces["game"], np.fromiter(outcomes, dtype=np.int64))
+        traces = {name: column[keep] for name, column in traces.items()}
+    if output_dir is None:
+        output_dir = traces_path if os.path.isdir(traces_path) else os.path.dirname(traces_path) or "."
+    os.makedirs(output_dir, exist_ok=True)
+
+    game = traces["game"]
+    starts = np.flatnonzero(np.r_[True, game[1:] != game[:-1]]) if len(game) else np.empty(0, dtype=np.intp)
+    ends = np.r_[starts[1:], len(game)].astype(np.intp)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(plot_campaign, traces, os.path.join(output_dir, f"campaign_gr.{fmt}"), outcomes)]
+        for lo, hi in list(zip(starts, ends))[:max_games]:
+            g = int(game[lo])
+            title = f"Game {g}" + ("" if outcomes is None or g not in outcomes else
+                                   f" ({'Win' if outcomes[g] else 'Lose'})")
+            columns = {field: traces[field][lo:hi] for field in PLOT_FIELDS}
+            futures.append(executor.submit(plot_game, traces["step"][lo:hi], columns,
+                                           os.path.join(output_dir, f"game_{g}_gr.{fmt}"), title))
+        return [future.result() for future in futures]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render GR plots of a finished campaign to image files.")
+    parser.add_argument("traces", help="columnar metrics store, directory of game_<n>_metrics.csv, or one CSV")
+    parser.add_argument("--results", help="game_results.csv, to split the plots into wins and losses")
+    parser.add_argument("--output", help="directory for the images (default: next to the traces)")
+    parser.add_argument("--max-games", type=int, default=50, help="per-game plots to render (default: 50)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="rendering processes (default: all cores)")
+    parser.add_argument("--format", default="png", help="image format (default: png)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    outcomes = None
+    if args.results:
+        outcomes = load_outcomes(args.results, key="Seed" if is_store(args.traces) else "Game")
+    paths = render_reports(args.traces, args.output, outcomes, args.max_games, args.workers, args.format)
+    print(f"{len(paths)} plots written to {os.path.dirname(paths[0]) if paths else args.output}")
+
+
+if __name__ == "__main__":
+    main()
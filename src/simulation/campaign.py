@@ -0,0 +1,121 @@
+import contextlib
+import io
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.ai.certain_moves import DecisionStats
+from src.metrics.aggregate import GRAggregator
+
+# Outcome of one campaign game, streamed back to the parent as soon as it finishes
+# (`metrics` is the game's GRAggregator when the campaign aggregates metrics)
+GameResult = namedtuple("GameResult", ["index", "seed", "won", "steps", "stats", "metrics"], defaults=(None,))
+
+
+def game_seed(master_seed, index):
+    """Deterministic board seed of game `index`, independent of how games are sharded."""
+    return random.Random(f"game-{master_seed}-{index}").getrandbits(32)
+
+
+def planner_seed(board_seed):
+    """Deterministic seed of the planner's random choices in the game played on `board_seed`."""
+    return random.Random(f"planner-{board_seed}").getrandbits(32)
+
+
+def _play_game(game_fn, index, seed, log_dir, quiet, profile, aggregate, game_kwargs):
+    # Runs in a worker (or inline): one game with a fresh DecisionStats
+    stats = DecisionStats()
+    log_file = os.path.join(log_dir, f"game_{index + 1}_metrics.csv") if log_dir else os.devnull
+    if profile:
+        game_kwargs = dict(game_kwargs, trace_file=os.path.join(log_dir, f"game_{index + 1}_trace.json"))
+    metrics = None
+    if aggregate:
+        metrics = GRAggregator()
+        game_kwargs = dict(game_kwargs, aggregator=metrics)
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with output:
+        won = game_fn(seed=seed, stats=stats, log_file=log_file, **game_kwargs)
+    return GameResult(index, seed, bool(won), stats.steps, stats, metrics)
+
+
+def iter_campaign(game_fn, num_games, master_seed=0, workers=0, log_dir=None, quiet=True, profile=False,
+                  aggregate=False, **game_kwargs):
+    """
+    Plays `num_games` games of `game_fn` and yields a GameResult per game as it completes.
+
+    `game_fn` is a module-level runner such as run_simulation.run_single_game; it is called as
+    game_fn(seed=..., stats=..., log_file=..., **game_kwargs). With workers > 1 the games are
+    sharded across a process pool and results arrive in completion order; otherwise they are
+    played inline in index order. Each game's board seed comes from game_seed(master_seed, index),
+    so a game plays the same whatever the worker count (time-limited searches excepted).
+    Per-game metrics go to `log_dir`/game_<n>_metrics.csv, or are discarded without a log_dir.
+    With `profile`, game_fn also gets trace_file=`log_dir`/game_<n>_trace.json (see simulation.game);
+    with `aggregate`, an aggregator=GRAggregator() to fill, returned as the result's `metrics`.
+    """
+    if profile and not log_dir:
+        raise ValueError("profile requires a log_dir for the trace files")
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    jobs = [(game_fn, i, game_seed(master_seed, i), log_dir, quiet, profile, aggregate, game_kwargs)
+            for i in range(num_games)]
+    if workers <= 1:
+        for job in jobs:
+            yield _play_game(*job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_play_game, *job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+class CampaignResult:
+    """
+    Aggregate of a campaign. Only order-independent integer sums are kept, so the totals
+    are identical whether the games ran inline or on any number of workers.
+    """
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.total_steps = 0
+        self.min_steps = None
+        self.max_steps = None
+        self.stats = DecisionStats()
+        self.metrics = None  # GRAggregator over every game, when the campaign aggregates
+
+    def add(self, result):
+        self.games += 1
+        self.wins += int(result.won)
+        self.total_steps += result.steps
+        self.min_steps = result.steps if self.min_steps is None else min(self.min_steps, result.steps)
+        self.max_steps = result.steps if self.max_steps is None else max(self.max_steps, result.steps)
+        self.stats.merge(result.stats)
+        if result.metrics is not None:
+            if self.metrics is None:
+                self.metrics = GRAggregator(result.metrics.compression)
+            self.metrics.merge(result.metrics)
+
+    def win_rate(self):
+        return self.wins / self.games if self.games > 0 else 0.0
+
+    def mean_steps(self):
+        return self.total_steps / self.games if self.games > 0 else 0.0
+
+    def summary(self):
+        return (f"Win rate: {self.wins}/{self.games} ({self.win_rate() * 100:.2f}%) | "
+                f"Steps: mean {self.mean_steps():.2f}, min {self.min_steps}, max {self.max_steps}\n"
+                f"{self.stats.summary()}")
+
+
+def run_campaign(game_fn, num_games, master_seed=0, workers=0, log_dir=None, quiet=True, profile=False,
+                 aggregate=False, on_result=None, **game_kwargs):
+    """
+    Runs a campaign (see iter_campaign) and returns its CampaignResult.
+    `on_result(result)` is called in the parent for every game as it streams in.
+    """
+    campaign = CampaignResult()
+    for result in iter_campaign(game_fn, num_games, master_seed, workers, log_dir, quiet, profile, aggregate,
+                                **game_kwargs):
+        campaign.add(result)
+        if on_result is not None:
+            on_result(result)
+    return campaign
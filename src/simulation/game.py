@@ -0,0 +1,156 @@
+import contextlib
+import inspect
+import io
+import os
+from src.ai.certain_moves import DecisionStats, certain_moves, apply_certain_moves
+from src.ai.macros import apply_action, expand_action
+from src.ai.opening_book import OpeningBook
+from src.ai.planner import PersistentPlanner
+from src.game.record import GameRecorder, RecordWriter
+from src.simulation.campaign import planner_seed
+from src.simulation.registry import VARIANTS, resolve
+from src.utils.columnar import ColumnarMetricsWriter
+from src.utils.logger import BufferedCSVLogger
+from src.utils.profiler import NULL_PROFILER, StepProfiler
+
+
+def supported_options(planner_class, options):
+    """The subset of `options` that PersistentPlanner or `planner_class` takes as keyword arguments."""
+    accepted = set(inspect.signature(PersistentPlanner.__init__).parameters)
+    accepted.update(inspect.signature(planner_class.__init__).parameters)
+    return {key: value for key, value in options.items() if key in accepted}
+
+
+def watch_components(profiler, bayes, gr, gm, planner):
+    """Registers with `profiler` the game components' containers that grow with the game length."""
+    for owner, obj in (("analyzer", bayes), ("metrics", gr), ("manager", gm)):
+        for attribute in ("history", "evidence", "moves"):
+            if isinstance(getattr(obj, attribute, None), (list, dict)):
+                profiler.watch(f"{owner}.{attribute}", getattr(obj, attribute))
+    profiler.watch("planner.tree", planner.tree)
+
+
+def play_game(variant="classic", width=9, height=9, mines=10, max_steps=200, stats=None, seed=None,
+              log_file="gr_metrics.csv", depth=None, verbose=False, profiler=None, trace_file=None, metrics_store=None,
+              aggregator=None, record_store=None, **overrides):
+    """
+    The run_simulation*.py game loop with every component picked from the registry.
+
+    `variant` selects the defaults (see registry.VARIANTS); `overrides` may replace any of
+    board, manager, analyzer, planner, metrics (registry names), planner_options (dict) and
+    clue_bias (bool). Takes the same seed/stats/log_file arguments as the runner scripts, so it
+    can be used with run_campaign. Component chatter is suppressed unless `verbose`.
+    A seeded game also seeds planners that take a `seed` (see campaign.planner_seed).
+    With `metrics_store` (a directory) the metrics rows go to that columnar store (see
+    utils/columnar.py) under the board seed as game id, instead of the CSV `log_file`.
+    The finished game's GR history is added to `aggregator` (a GRAggregator) if given.
+    With `record_store` (a directory) a compact record of the game is appended to it for replay
+    (see game/record.py).
+    Phases are timed with `profiler` (a StepProfiler, or a MemoryProfiler for allocations) if given;
+    with `trace_file` a new StepProfiler
+    is used and its Chrome trace and summary table are written next to it afterwards.
+    :return: True if the game was won.
+    """
+    config = dict(VARIANTS[variant])
+    if "planner" in overrides and overrides["planner"] != config["planner"] and "planner_options" not in overrides:
+        # The variant's options were written for its own planner class: keep only those the other one accepts
+        config["planner_options"] = supported_options(resolve("planner", overrides["planner"]),
+                                                      config.get("planner_options", {}))
+    config.update(overrides)
+    depth = config["depth"] if depth is None else depth
+
+    board = resolve("board", config["board"])(width, height, mines, seed=seed)
+    gm = resolve("manager", config["manager"])(board)
+    if record_store is not None:
+        gm = GameRecorder(gm)
+    bayes = resolve("analyzer", config["analyzer"])()
+    book = OpeningBook.load()
+    planner_class = resolve("planner", config["planner"])
+    planner_options = dict(config.get("planner_options", {}))
+    if seed is not None and "seed" not in planner_options and "seed" in inspect.signature(planner_class.__init__).parameters:
+        # Random playouts and sampled outcomes follow the board seed, so seeded campaigns replay exactly
+        planner_options["seed"] = planner_seed(seed)
+    # One planner per game so search work carries over between moves
+    planner = PersistentPlanner(planner_class, depth=depth, **planner_options)
+    gr = resolve("metrics", config["metrics"])()
+    if metrics_store is not None:
+        logger = ColumnarMetricsWriter(metrics_store, game=seed)
+    else:
+        logger = BufferedCSVLogger(log_file)
+    stats = stats if stats is not None else DecisionStats()
+    if trace_file is not None and profiler is None:
+        profiler = StepProfiler(os.path.splitext(os.path.basename(trace_file))[0])
+    profiler = profiler if profiler is not None else NULL_PROFILER
+    if profiler.enabled:
+        watch_components(profiler, bayes, gr, gm, planner)
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        step = 0
+        while not gm.is_over() and step < max_steps:
+            profiler.begin_step(step)
+            with profiler.phase("compute_probabilities"):
+                probabilities = bayes.compute_probabilities(board)
+            if verbose:
+                with profiler.phase("print_probability_matrix"):
+                    bayes.print_probability_matrix()
+
+            if config.get("clue_bias"):
+                # Same clue-score adjustment as run_simulationwithclues.py
+                for cell in board.get_unrevealed_cells():
+                    if cell.neighbor_mines > 0:
+                        probabilities[(cell.x, cell.y)] *= (1 + 0.1 * cell.neighbor_mines)
+
+            # Fast path: apply every provably safe/mined cell at once, skip the planner
+            batch = certain_moves(probabilities)
+            if batch:
+                with profiler.phase("make_move"):
+                    apply_certain_moves(gm, batch)
+                    planner.advance(board, batch)
+                stats.record_batch(batch)
+            else:
+                # Opening book first, the planner only for positions it does not cover
+                action = book.lookup(board)
+                if action is not None:
+                    stats.record_book()
+                else:
+                    with profiler.phase("search"):
+                        action = planner.find_best_action(board, probabilities)
+                    stats.record_planner()
+                    if profiler.enabled:
+                        profiler.count("search_nodes", planner.last_nodes)
+
+                if action is None:
+                    break
+
+                # Macro actions expand into their primitive moves
+                with profiler.phase("make_move"):
+                    apply_action(gm, action)
+                    planner.advance(board, expand_action(action))
+
+            with profiler.phase("metrics"):
+                gr_value, gr_data = gr.update(board, step, probabilities)
+            with profiler.phase("log"):
+                logger.log(step, gr_data)
+            if record_store is not None:
+                gm.end_step()
+
+            if profiler.enabled:
+                profiler.count("configurations", getattr(bayes, "configurations", 0))
+                profiler.count("unknown_cells", len(probabilities))
+                profiler.count("table_entries", len(planner.table) if planner.table is not None else 0)
+            profiler.end_step()
+            step += 1
+    profiler.end_game()
+
+    if trace_file is not None:
+        profiler.write_chrome_trace(trace_file)
+        with open(os.path.splitext(trace_file)[0] + "_summary.txt", "w") as f:
+            f.write(profiler.summary() + "\n")
+    logger.close()
+    if record_store is not None:
+        with RecordWriter(record_store) as records:
+            records.write(gm.record())
+    if aggregator is not None:
+        aggregator.add_game(gr.history, gm.is_victory())
+    return gm.is_victory()
@@ -0,0 +1,67 @@
+import importlib
+
+# Pluggable simulation components: kind -> name -> "module:attribute".
+# Classes are imported on first use, so e.g. the matplotlib-backed metrics only load when chosen.
+COMPONENTS = {
+    "board": {
+        "classic": "src.game.board:Board",
+        "sj": "src.game.board_sj:Board",
+        "withclues": "src.game.board_withclues:Board",
+    },
+    "manager": {
+        "classic": "src.game.game_manager:GameManager",
+        "sj": "src.game.game_manager_sj:GameManager",
+        "withclues": "src.game.game_manager_2:GameManager",
+    },
+    "analyzer": {
+        "bayesian": "src.ai.bayesian:BayesianAnalyzer",
+        "bayesian_sj": "src.ai.bayesian_sj:BayesianAnalyzer",
+        "bayesian_sj_2": "src.ai.bayesian_sj_2:BayesianAnalyzer",
+        "bayesian_sj_3": "src.ai.bayesian_sj_3:BayesianAnalyzer",
+        # Needs board.get_all_cells, i.e. the "withclues" board
+        "bayesian_withclue": "src.ai.bayesian_withclue:BayesianAnalyzer",
+        "rules": "src.ai.rule_based:RuleBasedAnalyzer",
+    },
+    "planner": {
+        "mdp": "src.ai.mdp:MDP",
+        "mdp_sj": "src.ai.mdp_sj:MDP",
+        "mdp_withclues": "src.ai.mdp_withclues:MDP",
+        "mcts": "src.ai.mcts:MCTS",
+        "vectorized": "src.ai.vectorized:VectorizedGreedy",
+        "rules": "src.ai.rule_based:RuleBasedPolicy",
+    },
+    "metrics": {
+        "classic": "src.metrics.dynamic_gr:DynamicGR",
+        "sj": "src.metrics.dynamic_gr_sj:DynamicGR",
+    },
+}
+
+# The combinations wired into the three run_simulation*.py scripts
+VARIANTS = {
+    "classic": {"board": "classic", "manager": "classic", "analyzer": "bayesian_sj_2", "planner": "mdp",
+                "metrics": "classic", "depth": 2, "planner_options": {"reduce_actions": True}},
+    # A node budget rather than a time limit keeps seeded sj games independent of machine load
+    "sj": {"board": "sj", "manager": "sj", "analyzer": "bayesian_sj_3", "planner": "mdp_sj",
+           "metrics": "sj", "depth": 4, "planner_options": {"reduce_actions": True, "node_limit": 2000}},
+    "withclues": {"board": "withclues", "manager": "withclues", "analyzer": "bayesian_withclue",
+                  "planner": "mdp_withclues", "metrics": "classic", "depth": 2,
+                  "planner_options": {"reduce_actions": True}, "clue_bias": True},
+    "rules": {"board": "classic", "manager": "classic", "analyzer": "rules", "planner": "rules",
+              "metrics": "classic", "depth": 0, "planner_options": {"endgame_threshold": 0}},
+}
+
+
+def resolve(kind, name):
+    """Returns the registered class of the given kind (board, manager, analyzer, planner, metrics)."""
+    try:
+        path = COMPONENTS[kind][name]
+    except KeyError:
+        choices = ", ".join(sorted(COMPONENTS.get(kind, {})))
+        raise ValueError(f"Unknown {kind} '{name}' (choose from: {choices})")
+    module, attribute = path.split(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def register(kind, name, path):
+    """Adds a component, given as "module:attribute", so it can be picked by name."""
+    COMPONENTS.setdefault(kind, {})[name] = path
@@ -0,0 +1,123 @@
+"""
+Columnar binary metrics store.
+
+A store is a directory of parts, one per writing process (part-<pid>), so campaign workers
+never share a file. A part holds one append-only file per column, <column>.col:
+    32-byte header: b"GRCOL" | version (1 byte) | NumPy dtype string, NUL-padded
+    then the values as a raw little-endian array of that dtype.
+Readers memory-map the files and return NumPy views without copying.
+"""
+import glob
+import os
+import numpy as np
+
+MAGIC = b"GRCOL"
+VERSION = 1
+HEADER_SIZE = 32
+
+# Column -> dtype; "game" identifies the game (its board seed in simulation runs, -1 if unseeded)
+COLUMNS = {
+    "game": "<i8",
+    "step": "<i4",
+    "gr": "<f8",
+    "complexity": "<f8",
+    "goal_progress": "<f8",
+    "entropy": "<f8",
+    "acceleration": "<f8",
+    "jerk": "<f8",
+}
+
+
+def _header(dtype):
+    header = MAGIC + bytes([VERSION]) + np.dtype(dtype).str.encode()
+    return header.ljust(HEADER_SIZE, b"\0")
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f"{path} is not a columnar metrics file")
+    if header[len(MAGIC)] != VERSION:
+        raise ValueError(f"{path}: unsupported version {header[len(MAGIC)]}")
+    return np.dtype(header[len(MAGIC) + 1:].rstrip(b"\0").decode())
+
+
+class ColumnarMetricsWriter:
+    """
+    Logger with the BufferedCSVLogger interface that appends rows to this process's part of a store.
+    Rows are buffered and written column by column every `batch_size` rows and on close.
+    """
+    def __init__(self, directory, game=-1, batch_size=4096):
+        self.path = os.path.join(directory, f"part-{os.getpid()}")
+        os.makedirs(self.path, exist_ok=True)
+        self.game = -1 if game is None else game
+        self.batch_size = batch_size
+        self.buffer = []
+        self.files = {}
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(self.path, f"{name}.col")
+            if not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+                with open(path, "wb") as f:
+                    f.write(_header(dtype))
+            elif _read_header(path) != np.dtype(dtype):
+                raise ValueError(f"{path} has dtype {_read_header(path)}, expected {dtype}")
+            self.files[name] = open(path, "ab")
+
+    def log(self, step, gr_data):
+        self.buffer.append((self.game, step, gr_data['gr'], gr_data['complexity'], gr_data['goal_progress'],
+                            gr_data['entropy'], gr_data['acceleration'], gr_data['jerk']))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        for values, (name, dtype) in zip(zip(*rows), COLUMNS.items()):
+            self.files[name].write(np.asarray(values, dtype=dtype).tobytes())
+            self.files[name].flush()
+
+    def close(self):
+        if not self.files:
+            return
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_part(path):
+    """Memory-maps one part: {column: read-only array view}. Columns are cut to their common length."""
+    columns = {}
+    for name in COLUMNS:
+        file = os.path.join(path, f"{name}.col")
+        dtype = _read_header(file)
+        rows = (os.path.getsize(file) - HEADER_SIZE) // dtype.itemsize
+        columns[name] = (np.memmap(file, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(rows,))
+                         if rows > 0 else np.empty(0, dtype=dtype))
+    rows = min(len(column) for column in columns.values())
+    return {name: column[:rows] for name, column in columns.items()}
+
+
+def open_store(directory):
+    """Memory-maps every part of a store; returns a list of {column: view}, one per part."""
+    return [open_part(path) for path in sorted(glob.glob(os.path.join(directory, "part-*")))]
+
+
+def load_store(directory):
+    """
+    All rows of a store as {column: array}. A single-part store comes back as memory-mapped
+    views; several parts are concatenated (one copy per column).
+    """
+    parts = open_store(directory)
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0, dtype=dtype)
+            for name, dtype in COLUMNS.items()}
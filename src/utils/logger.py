@@ -1,14 +1,63 @@
 import csv
+import queue
+import threading
 
-class CSVLogger:
-    def __init__(self, filename):
+class BufferedCSVLogger:
+    """
+    Writes the per-step metrics CSV. Keeps the file open and writes rows in batches:
+    rows are buffered in memory and written every `batch_size` rows and on flush/close.
+    With `background=True` the batches are handed to a writer thread, so `log` never
+    waits on the disk. Close it (or use it as a context manager) to write the last batch.
+    """
+    def __init__(self, filename, batch_size=1000, background=False):
         self.filename = filename
-        with open(self.filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Step", "GR", "Complexity", "Goal_Progress", "Entropy", "Acceleration", "Jerk"])
+        self.batch_size = batch_size
+        self.buffer = []
+        self.file = open(self.filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["Step", "GR", "Complexity", "Goal_Progress", "Entropy", "Acceleration", "Jerk"])
+        self.queue = None
+        self.thread = None
+        if background:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(target=self._drain, daemon=True)
+            self.thread.start()
 
     def log(self, step, gr_data):
-        with open(self.filename, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([step, gr_data['gr'], gr_data['complexity'], gr_data['goal_progress'],
-                             gr_data['entropy'], gr_data['acceleration'], gr_data['jerk']])
+        self.buffer.append([step, gr_data['gr'], gr_data['complexity'], gr_data['goal_progress'],
+                            gr_data['entropy'], gr_data['acceleration'], gr_data['jerk']])
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Hands the buffered rows to the disk (or to the writer thread)."""
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        if self.queue is not None:
+            self.queue.put(rows)
+        else:
+            self.writer.writerows(rows)
+
+    def _drain(self):
+        # Writer thread: one batch per queue item, None to stop
+        while True:
+            rows = self.queue.get()
+            if rows is None:
+                break
+            self.writer.writerows(rows)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,139 @@
+import contextlib
+import gc
+import sys
+import tracemalloc
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by `obj` and everything it references (containers, __dict__, __slots__)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += deep_size(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+class MemoryProfiler:
+    """
+    Opt-in memory accounting with tracemalloc, pluggable wherever a StepProfiler is accepted.
+
+    Per step: current and peak traced bytes and the bytes retained since the step began.
+    Per phase: bytes retained by the phase and its allocation peak.
+    Per owner (registered with `watch`): deep size at the end of every step and game.
+    Per game: bytes still traced after a collection, plus the allocation sites that grew
+    since the previous game. Keep one instance across games (an inline campaign) so that
+    `growing()` can flag owners and sites that grow steadily from game to game.
+    """
+    enabled = True
+
+    def __init__(self, top=10):
+        self.top = top
+        self.owned_tracing = not tracemalloc.is_tracing()
+        if self.owned_tracing:
+            tracemalloc.start()
+        self.step = 0
+        self.step_start = 0
+        self.step_peak = 0
+        self.owners = {}
+        self.steps = []        # (game, step, current, peak, retained)
+        self.phases = {}       # phase -> [calls, retained bytes, max peak]
+        self.owner_steps = {}  # owner -> deep size at the last step
+        self.games = []        # {"retained", "owners", "sites"} per game
+        self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        if self.owned_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def begin_step(self, step):
+        self.step = step
+        self.step_start, _ = tracemalloc.get_traced_memory()
+        self.step_peak = self.step_start
+        tracemalloc.reset_peak()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            self.step_peak = max(self.step_peak, peak)
+            stats = self.phases.setdefault(name, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += after - before
+            stats[2] = max(stats[2], peak - before)
+
+    def count(self, name, value):
+        pass
+
+    def watch(self, name, obj):
+        """Registers an object whose deep size is reported (e.g. "gr.history", gr.history)."""
+        self.owners[name] = obj
+
+    def end_step(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.steps.append((len(self.games), self.step, current, max(self.step_peak, peak), current - self.step_start))
+        for name, obj in self.owners.items():
+            self.owner_steps[name] = deep_size(obj)
+
+    def end_game(self):
+        owners = {name: deep_size(obj) for name, obj in self.owners.items()}
+        self.owners = {}
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        sites = [(str(stat.traceback[0]), stat.size_diff) for stat in
+                 snapshot.compare_to(self.snapshot, "lineno")[:self.top] if stat.size_diff > 0]
+        self.snapshot = snapshot
+        self.games.append({"retained": retained, "owners": owners, "sites": sites})
+
+    def growing(self, min_games=3):
+        """Owners (and "retained") whose end-of-game size rose in each of the last `min_games` games."""
+        if len(self.games) < min_games:
+            return []
+        recent = self.games[-min_games:]
+        series = {"retained": [game["retained"] for game in recent]}
+        for name in recent[-1]["owners"]:
+            series[name] = [game["owners"].get(name, 0) for game in recent]
+        return [name for name, sizes in series.items() if all(a < b for a, b in zip(sizes, sizes[1:]))]
+
+    def report(self):
+        lines = [f"{'game':>5}{'steps':>7}{'peak KiB':>12}{'retained/step KiB':>20}{'after game KiB':>16}"]
+        for game, summary in enumerate(self.games):
+            steps = [s for s in self.steps if s[0] == game]
+            peak = max((s[3] for s in steps), default=0)
+            retained = max((s[4] for s in steps), default=0)
+            lines.append(f"{game + 1:>5}{len(steps):>7}{peak / 1024:>12.1f}{retained / 1024:>20.1f}"
+                         f"{summary['retained'] / 1024:>16.1f}")
+
+        lines.append(f"{'phase':<26}{'calls':>7}{'retained KiB':>14}{'max peak KiB':>14}")
+        for name, (calls, retained, peak) in sorted(self.phases.items(), key=lambda item: -item[1][2]):
+            lines.append(f"{name:<26}{calls:>7}{retained / 1024:>14.1f}{peak / 1024:>14.1f}")
+
+        if self.games:
+            lines.append(f"{'owner (end of game)':<26}" + "".join(f"{'game ' + str(i + 1):>12}"
+                                                                   for i in range(len(self.games))))
+            for name in self.games[-1]["owners"]:
+                lines.append(f"{name:<26}" + "".join(f"{game['owners'].get(name, 0) / 1024:>12.1f}"
+                                                     for game in self.games))
+            lines.append("top allocation sites grown during the last game:")
+            for site, diff in self.games[-1]["sites"]:
+                lines.append(f"  {diff / 1024:>10.1f} KiB  {site}")
+
+        growing = self.growing()
+        lines.append("growing across games: " + (", ".join(growing) if growing else "none"))
+        return "\n".join(lines)
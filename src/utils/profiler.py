@@ -0,0 +1,120 @@
+import contextlib
+import json
+import time
+
+
+class NullProfiler:
+    """Disabled profiler: every hook is a no-op returning a shared null context."""
+    enabled = False
+    _null = contextlib.nullcontext()
+
+    def begin_step(self, step):
+        pass
+
+    def phase(self, name):
+        return self._null
+
+    def count(self, name, value):
+        pass
+
+    def watch(self, name, obj):
+        pass
+
+    def end_step(self):
+        pass
+
+    def end_game(self):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StepProfiler:
+    """
+    Per-phase timings of the simulation loop (compute_probabilities, search, make_move, ...)
+    plus per-step counters (search nodes, configurations, component sizes).
+
+    Usage:
+        profiler.begin_step(step)
+        with profiler.phase("search"):
+            ...
+        profiler.count("search_nodes", n)
+        profiler.end_step()
+    Containers registered with `watch` have their length counted at every end_step.
+    The recording can be exported as a Chrome trace-event file (chrome://tracing, Perfetto)
+    and summarized as a per-phase table.
+    """
+    enabled = True
+
+    def __init__(self, name="game"):
+        self.name = name
+        self.origin = time.perf_counter()
+        self.step = 0
+        self.spans = []     # (phase, step, start, duration) in seconds since origin
+        self.counters = []  # (counter, step, time, value)
+        self.watched = {}
+
+    def begin_step(self, step):
+        self.step = step
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.spans.append((name, self.step, start - self.origin, end - start))
+
+    def count(self, name, value):
+        self.counters.append((name, self.step, time.perf_counter() - self.origin, value))
+
+    def watch(self, name, obj):
+        self.watched[name] = obj
+
+    def end_step(self):
+        for name, obj in self.watched.items():
+            self.count(name, len(obj))
+
+    def end_game(self):
+        self.watched = {}
+
+    def chrome_trace(self, pid=0):
+        """Trace events: one complete ("X") event per phase span and one counter ("C") event per sample."""
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+        for name, step, start, duration in self.spans:
+            events.append({"name": name, "cat": "phase", "ph": "X", "pid": pid, "tid": 0,
+                           "ts": start * 1e6, "dur": duration * 1e6, "args": {"step": step}})
+        for name, step, ts, value in self.counters:
+            events.append({"name": name, "cat": "counter", "ph": "C", "pid": pid, "tid": 0,
+                           "ts": ts * 1e6, "args": {name: value}})
+        return events
+
+    def write_chrome_trace(self, path, pid=0):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.chrome_trace(pid), "displayTimeUnit": "ms"}, f)
+
+    def summary(self):
+        """Per-phase table (calls, total, mean, max, share of profiled time) followed by counter totals."""
+        phases = {}
+        for name, _, _, duration in self.spans:
+            calls, total, peak = phases.get(name, (0, 0.0, 0.0))
+            phases[name] = (calls + 1, total + duration, max(peak, duration))
+        overall = sum(total for _, total, _ in phases.values()) or 1.0
+
+        lines = [f"{self.name}: {self.step + 1} steps",
+                 f"{'phase':<26}{'calls':>7}{'total ms':>12}{'mean ms':>10}{'max ms':>10}{'share':>8}"]
+        for name, (calls, total, peak) in sorted(phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<26}{calls:>7}{total * 1e3:>12.2f}{total / calls * 1e3:>10.3f}"
+                         f"{peak * 1e3:>10.3f}{total / overall:>8.1%}")
+
+        counters = {}
+        for name, _, _, value in self.counters:
+            samples, total, peak = counters.get(name, (0, 0, 0))
+            counters[name] = (samples + 1, total + value, max(peak, value))
+        if counters:
+            lines.append(f"{'counter':<26}{'samples':>7}{'total':>12}{'mean':>10}{'max':>10}")
+            for name, (samples, total, peak) in sorted(counters.items()):
+                lines.append(f"{name:<26}{samples:>7}{total:>12}{total / samples:>10.1f}{peak:>10}")
+        return "\n".join(lines)